@@ -0,0 +1,181 @@
+"""
+This module contains running accumulators for streak statistics.
+It lets every engine fill the same set of tables in a single pass, using memory
+bounded by O(n**2) rather than O(n! * n).
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from streaks2.batch import find_streaks_batch
+from streaks2.utils import SummaryIndex, add_summary_row_column
+
+SUM = SummaryIndex.SUM.value
+
+
+def streak_length_counts(
+    lengths: np.ndarray, counts: np.ndarray, width: int, dtype=np.intp
+) -> np.ndarray:
+    """Counts the streaks of each length in each row of a batch.
+
+    Args:
+        lengths (np.ndarray): Streak lengths, row by row, as from `find_streaks_batch`.
+        counts (np.ndarray): The number of streaks in each row.
+        width (int): n + 1, the number of columns in the result.
+        dtype: The integer type of the result.
+
+    Returns:
+        np.ndarray: A (rows, width) array; [r, k] is the number of streaks of length k in row r.
+    """
+    rows = np.repeat(np.arange(counts.size), counts)
+    per_row = np.bincount(rows * width + lengths, minlength=counts.size * width)
+    return per_row.reshape(counts.size, width).astype(dtype, copy=False)
+
+
+class StreakAccumulators:
+    """
+    Running totals of streak statistics over permutations of the integers from 1 to n.
+    """
+
+    # The tables, by attribute name, that are saved and merged.
+    FIELDS = ("lengths", "counts", "sl", "present", "count_longest")
+
+    def __init__(self, n: int, dtype=int):
+        """Initializes empty accumulators.
+
+        Args:
+            n (int): The upper limit of the range of integers being permuted.
+            dtype: The NumPy dtype of the tables. Use `object` for arbitrary precision.
+        """
+        self.n = n
+        self.permutations = 0
+        # lengths[k]: streaks of length k, over all permutations seen.
+        self.lengths = np.zeros(n + 1, dtype=dtype)
+        # counts[c]: permutations with exactly c streaks.
+        self.counts = np.zeros(n + 1, dtype=dtype)
+        # sl[s, k]: streaks that start with s and have length k.
+        self.sl = np.zeros((n + 1, n + 1), dtype=dtype)
+        # present[k]: permutations with at least one streak of length k.
+        self.present = np.zeros(n + 1, dtype=dtype)
+        # count_longest[c, l]: permutations with c streaks, the longest of length l.
+        self.count_longest = np.zeros((n + 1, n + 1), dtype=dtype)
+
+    def add(self, kv_streaks: Dict[int, int]) -> None:
+        """Adds the streaks of one permutation to the totals.
+
+        Args:
+            kv_streaks (Dict[int, int]): Streak lengths, indexed by the first element
+                of the streak, as in `KvStreaks.kv_streaks`.
+        """
+        self.permutations += 1
+        self.counts[len(kv_streaks)] += 1
+        for start, length in kv_streaks.items():
+            self.lengths[length] += 1
+            self.sl[start, length] += 1
+        for length in set(kv_streaks.values()):
+            self.present[length] += 1
+        self.count_longest[len(kv_streaks), max(kv_streaks.values(), default=0)] += 1
+
+    def add_batch(self, perms: np.ndarray) -> None:
+        """Adds the streaks of a block of permutations to the totals, with whole-array operations.
+
+        Args:
+            perms (np.ndarray): An (m, n) array, one permutation of 1..n per row.
+        """
+        starts, lengths, counts = find_streaks_batch(perms)
+        self.add_streaks(len(perms), starts, lengths, counts)
+
+    def add_streaks(
+        self, m: int, starts: np.ndarray, lengths: np.ndarray, counts: np.ndarray
+    ) -> np.ndarray:
+        """Adds streaks already found by `find_streaks_batch` to the totals.
+
+        Args:
+            m (int): The number of permutations the streaks came from.
+            starts (np.ndarray): The first element of every streak.
+            lengths (np.ndarray): The length of every streak.
+            counts (np.ndarray): The number of streaks in each permutation.
+
+        Returns:
+            np.ndarray: The (m, n + 1) streak-length counts of each permutation,
+                as from `streak_length_counts`, for callers that keep more statistics.
+        """
+        width = self.n + 1
+        self.permutations += m
+        self.counts += np.bincount(counts, minlength=width)
+        self.sl += np.bincount(
+            starts.astype(np.intp) * width + lengths, minlength=width * width
+        ).reshape(width, width)
+        per_row = streak_length_counts(lengths, counts, width)
+        self.lengths += np.sum(per_row, axis=0)
+        self.present += np.count_nonzero(per_row, axis=0)
+        longest = np.zeros(m, dtype=np.intp)
+        if lengths.size:
+            firsts = np.cumsum(counts) - counts
+            longest = np.maximum.reduceat(lengths, firsts).astype(np.intp)
+        self.count_longest += np.bincount(
+            counts.astype(np.intp) * width + longest, minlength=width * width
+        ).reshape(width, width)
+        return per_row
+
+    def merge(self, other: "StreakAccumulators") -> None:
+        """Adds the totals of another set of accumulators, over different permutations, to these.
+
+        Args:
+            other (StreakAccumulators): Accumulators for the same n.
+        """
+        if other.n != self.n:
+            raise ValueError("Accumulators must be for the same n.")
+        self.permutations += other.permutations
+        for name in self.FIELDS:
+            getattr(self, name)[...] += getattr(other, name)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Returns the totals as named arrays, suitable for `np.savez`."""
+        arrays = {name: getattr(self, name) for name in self.FIELDS}
+        arrays["n"] = np.array(self.n)
+        arrays["permutations"] = np.array(self.permutations)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "StreakAccumulators":
+        """Rebuilds accumulators from the arrays returned by `to_arrays`.
+
+        Args:
+            arrays: A mapping of names to arrays, such as the result of `np.load`.
+
+        Returns:
+            StreakAccumulators: Accumulators holding the same totals.
+        """
+        accumulators = cls(int(arrays["n"]))
+        accumulators.permutations = int(arrays["permutations"])
+        for name in cls.FIELDS:
+            setattr(accumulators, name, np.array(arrays[name]))
+        return accumulators
+
+    def length_summary(self) -> np.ndarray:
+        """Returns the number of streaks of each length, with the total at SUM."""
+        summary = self.lengths.copy()
+        summary[SUM] = np.sum(self.lengths[1:])
+        return summary
+
+    def count_summary(self) -> np.ndarray:
+        """Returns the number of permutations with each streak count, with the total at SUM."""
+        summary = self.counts.copy()
+        summary[SUM] = self.permutations
+        return summary
+
+    def sl_summary(self) -> np.ndarray:
+        """Returns the start-by-length table, with a summary row and column."""
+        return add_summary_row_column(self.sl)
+
+    def absent_summary(self) -> np.ndarray:
+        """Returns the number of permutations lacking each streak length, with the total at SUM."""
+        summary = self.permutations - self.present
+        summary[SUM] = np.sum(summary[1:])
+        return summary
+
+    def count_longest_summary(self) -> np.ndarray:
+        """Returns the count-by-longest-streak table, with a summary row and column."""
+        return add_summary_row_column(self.count_longest)
@@ -0,0 +1,56 @@
+"""
+This module decomposes many permutations into streaks at once, using NumPy.
+Each row of a 2-D array is one permutation, and every streak boundary is found
+in a handful of array operations instead of a Python loop per element.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def streak_start_mask(perms: np.ndarray) -> np.ndarray:
+    """Marks the first element of every streak.
+
+    A streak starts at each left-to-right minimum of its row.
+
+    Args:
+        perms (np.ndarray): An (m, n) integer array, one sequence of distinct integers per row.
+
+    Returns:
+        np.ndarray: An (m, n) boolean array, True where a streak starts.
+    """
+    perms = np.asarray(perms)
+    if perms.ndim != 2:
+        raise ValueError("Input array must be 2-dimensional.")
+    return perms == np.minimum.accumulate(perms, axis=1)
+
+
+def find_streaks_batch(
+    perms: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decomposes every row of a 2-D array into streaks.
+
+    Streaks are listed row by row, in the order they occur, so the first counts[0]
+    entries of starts and lengths belong to row 0, the next counts[1] to row 1, and so on.
+
+    Args:
+        perms (np.ndarray): An (m, n) integer array, one sequence of distinct integers per row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The first element of each streak,
+            the length of each streak, and the number of streaks in each row.
+    """
+    perms = np.asarray(perms)
+    mask = streak_start_mask(perms)
+    m, n = perms.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return perms.reshape(-1), empty, np.zeros(m, dtype=np.intp)
+
+    # Every row starts a streak, so the gap to the next start never crosses a row.
+    positions = np.flatnonzero(mask)
+    lengths = np.diff(positions, append=m * n)
+    starts = perms.reshape(-1)[positions]
+    counts = np.diff(np.searchsorted(positions, np.arange(m + 1) * n))
+    return starts, lengths, counts
@@ -0,0 +1,256 @@
+"""
+This module benchmarks the throughput and peak memory of the library's main entry points.
+
+    python -m streaks2.bench run [--quick] [--output results.json]
+    python -m streaks2.bench compare baseline.json results.json [--threshold 0.1]
+
+`run` writes the results as JSON, with the environment they were measured in.
+`compare` lists every case that got slower, or used more memory, than the baseline
+by more than the threshold, and exits with status 1 if there are any.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from math import factorial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+# Cases faster than this are repeated, and the best time kept.
+MIN_SECONDS = 0.5
+REPEAT = 3
+DEFAULT_THRESHOLD = 0.1
+
+
+class Case(NamedTuple):
+    """One benchmark: a call, and the number of items it processes."""
+
+    name: str
+    run: Callable[[], object]
+    items: int
+
+
+def _sequence(length: int) -> List[int]:
+    return (np.random.default_rng(length).permutation(length) + 1).tolist()
+
+
+def cases(quick: bool = False) -> List[Case]:
+    """Returns the benchmark cases.
+
+    Args:
+        quick (bool): Use smaller sizes, for a run of a few seconds.
+    """
+    from streaks2.streaks import KvStreaks, Streaks, StreakStatistics
+    from streaks2.utils import (
+        add_summary_row_column,
+        generate_permutations,
+        invert_zeros_and_nonzeros,
+    )
+
+    lengths = (100, 10_000) if quick else (100, 10_000, 1_000_000)
+    stats_range = range(6, 9) if quick else range(6, 12)
+    generator_n = 7 if quick else 9
+    rows = 100_000 if quick else 4_000_000
+
+    result = []
+    for length in lengths:
+        seq = _sequence(length)
+        result.append(
+            Case(f"Streaks[len={length}]", lambda seq=seq: Streaks(seq), length)
+        )
+        result.append(
+            Case(f"KvStreaks[len={length}]", lambda seq=seq: KvStreaks(seq), length)
+        )
+
+    n, total = generator_n, factorial(generator_n)
+    result += [
+        Case(
+            f"generate_permutations[n={n}]",
+            lambda: sum(1 for _ in generate_permutations(n)),
+            total,
+        ),
+        Case(
+            f"generate_streaks_for_all_permutations[n={n}]",
+            lambda: sum(1 for _ in Streaks.generate_streaks_for_all_permutations(n)),
+            total,
+        ),
+        Case(
+            f"generate_kv_streaks_for_all_permutations[n={n}]",
+            lambda: sum(
+                1 for _ in KvStreaks.generate_kv_streaks_for_all_permutations(n)
+            ),
+            total,
+        ),
+    ]
+    for n in stats_range:
+        result.append(
+            Case(
+                f"StreakStatistics[n={n}]",
+                lambda n=n: StreakStatistics(n),
+                factorial(n),
+            )
+        )
+
+    arr = np.random.default_rng(0).integers(0, 3, size=(rows, 12), dtype=np.uint8)
+    result += [
+        Case(
+            f"add_summary_row_column[rows={rows}]",
+            lambda: add_summary_row_column(arr),
+            rows,
+        ),
+        Case(
+            f"invert_zeros_and_nonzeros[rows={rows}]",
+            lambda: invert_zeros_and_nonzeros(arr),
+            rows,
+        ),
+    ]
+    return result
+
+
+def measure(case: Case) -> Dict[str, object]:
+    """Times a case, then runs it once more under tracemalloc for its peak memory.
+
+    Returns:
+        Dict[str, object]: The best time in seconds, items per second, and peak bytes allocated.
+    """
+    times = []
+    while len(times) < REPEAT and (not times or sum(times) < MIN_SECONDS):
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "name": case.name,
+        "items": case.items,
+        "seconds": seconds,
+        "throughput": case.items / seconds if seconds else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def environment() -> Dict[str, object]:
+    """Returns what a benchmark result depends on besides the code."""
+    from streaks2.cache import library_version
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "streaks2": library_version(),
+    }
+
+
+def run_benchmarks(
+    quick: bool = False, select: Optional[str] = None, log=None
+) -> Dict[str, object]:
+    """Runs the benchmark cases.
+
+    Args:
+        quick (bool): Use smaller sizes.
+        select (Optional[str]): Run only the cases whose names contain this string.
+        log: A file to report each result to as it finishes, such as sys.stderr.
+
+    Returns:
+        Dict[str, object]: The environment and a list of results, ready for JSON.
+    """
+    results = []
+    for case in cases(quick):
+        if select is not None and select not in case.name:
+            continue
+        result = measure(case)
+        results.append(result)
+        if log is not None:
+            print(
+                f"{case.name:50} {result['seconds']:10.4f} s {result['throughput']:14.0f}/s "
+                f"{result['peak_bytes'] / 2**20:10.1f} MiB",
+                file=log,
+            )
+    return {"environment": environment(), "results": results}
+
+
+def compare(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """Finds the cases that regressed between two runs.
+
+    Args:
+        baseline (Dict[str, object]): The results of `run_benchmarks` to compare against.
+        current (Dict[str, object]): The results of a later run.
+        threshold (float): The relative increase in time or peak memory that counts as a regression.
+
+    Returns:
+        List[str]: One description per regression. Cases in only one run are ignored.
+    """
+    before = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(result["name"])
+        if old is None:
+            continue
+        for field, unit in (("seconds", "s"), ("peak_bytes", "bytes")):
+            if result[field] > old[field] * (1 + threshold):
+                regressions.append(
+                    f"{result['name']}: {field} {old[field]:.4g} -> {result[field]:.4g} {unit} "
+                    f"(+{result[field] / max(old[field], 1e-12) - 1:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m streaks2.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("--quick", action="store_true", help="use smaller sizes")
+    run.add_argument("--select", help="run only cases whose names contain this")
+    run.add_argument(
+        "--output", help="write the results here, instead of standard output"
+    )
+    comparison = commands.add_parser(
+        "compare", help="flag regressions against a baseline"
+    )
+    comparison.add_argument("baseline")
+    comparison.add_argument("current")
+    comparison.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_benchmarks(args.quick, args.select, log=sys.stderr)
+        if args.output is None:
+            json.dump(results, sys.stdout, indent=2)
+        else:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
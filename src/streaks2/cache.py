@@ -0,0 +1,253 @@
+"""
+This module keeps computed StreakStatistics tables in a persistent on-disk cache.
+Entries are keyed by a hash of n, the engine and the library version. Fixed-width
+tables are stored as .npy files and memory-mapped on load; arbitrary-precision
+tables are stored losslessly as JSON integers. Writes are atomic renames, so several
+processes can share one cache, and the least recently used entries are evicted
+once the cache grows past its size cap.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Part of every cache key; bump it when the set of stored tables changes.
+FORMAT = 2
+
+
+def library_version() -> str:
+    """Returns the installed version of streaks2, which is part of every cache key."""
+    try:
+        return metadata.version("streaks2")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def default_directory() -> str:
+    """Returns $STREAKS2_CACHE_DIR, or ~/.cache/streaks2."""
+    return os.environ.get(
+        "STREAKS2_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "streaks2"),
+    )
+
+
+class StoredStreakTables:
+    """
+    Summary tables loaded from the cache.
+
+    Provides the same summaries as `StreakAccumulators`. A table the entry lacks, because
+    it had not been computed when the entry was stored, is computed by the engine.
+    """
+
+    def __init__(self, tables: Dict[str, np.ndarray], compute: Callable[[], object]):
+        """Initializes the tables.
+
+        Args:
+            tables (Dict[str, np.ndarray]): The tables found in the cache, by name.
+            compute (Callable[[], object]): Runs the engine, for the tables that are missing.
+        """
+        self.tables = tables
+        self.compute = compute
+        self._computed = None
+
+    def _table(self, name: str, summary: str) -> np.ndarray:
+        if name not in self.tables:
+            if self._computed is None:
+                self._computed = self.compute()
+            self.tables[name] = getattr(self._computed, summary)()
+        return self.tables[name]
+
+    def length_summary(self) -> np.ndarray:
+        return self._table("length_counts", "length_summary")
+
+    def count_summary(self) -> np.ndarray:
+        return self._table("counts", "count_summary")
+
+    def sl_summary(self) -> np.ndarray:
+        return self._table("sl_streak_counts", "sl_summary")
+
+    def absent_summary(self) -> np.ndarray:
+        return self._table("absent_counts", "absent_summary")
+
+    def count_longest_summary(self) -> np.ndarray:
+        return self._table("count_longest_counts", "count_longest_summary")
+
+
+class ResultCache:
+    """
+    A content-addressed directory of computed StreakStatistics tables.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """Initializes a cache, creating its directory if needed.
+
+        Args:
+            directory (Optional[str]): Where entries live. Defaults to `default_directory()`.
+            max_bytes (int): The size the cache is trimmed to, oldest use first, after each write.
+        """
+        self.directory = default_directory() if directory is None else str(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(n: int, engine: str) -> str:
+        """Returns the cache key for the tables of n computed by engine."""
+        description = {
+            "n": n,
+            "engine": engine,
+            "version": library_version(),
+            "format": FORMAT,
+        }
+        return hashlib.sha256(
+            json.dumps(description, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, n: int, engine: str) -> Optional[Dict[str, np.ndarray]]:
+        """Looks up the tables of n computed by engine.
+
+        Args:
+            n (int): The upper limit of the range of integers permuted.
+            engine (str): The engine that computed the tables.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: The tables, fixed-width ones memory-mapped,
+                or None on a miss.
+        """
+        path = self._path(self.key(n, engine))
+        try:
+            tables = {}
+            for entry in os.listdir(path):
+                name, kind = os.path.splitext(entry)
+                if entry.startswith(".") or name == "meta":
+                    continue  # metadata, or a table still being added
+                if kind == ".npy":
+                    tables[name] = np.load(os.path.join(path, entry), mmap_mode="r")
+                else:
+                    with open(os.path.join(path, entry)) as f:
+                        tables[name] = np.array(json.load(f), dtype=object)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return tables
+
+    def put(self, n: int, engine: str, tables: Dict[str, np.ndarray]) -> None:
+        """Stores the tables of n computed by engine.
+
+        The entry is written to a temporary directory and renamed into place, so readers
+        never see a partial entry, and a concurrent writer of the same entry simply wins.
+
+        Args:
+            n (int): The upper limit of the range of integers permuted.
+            engine (str): The engine that computed the tables.
+            tables (Dict[str, np.ndarray]): The tables, by name.
+        """
+        path = self._path(self.key(n, engine))
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        for name, table in tables.items():
+            _save_table(tmp, name, table)
+        meta = {"n": n, "engine": engine, "version": library_version()}
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # another process stored it first
+        self.evict(keep=path)
+
+    def add(self, n: int, engine: str, name: str, table: np.ndarray) -> None:
+        """Adds a table to an existing entry, such as one that was computed after the entry was stored.
+
+        The table is written under a temporary name and renamed into place, so readers see
+        all of it or none of it. Nothing is written if the entry is missing or already has it.
+
+        Args:
+            n (int): The upper limit of the range of integers permuted.
+            engine (str): The engine that computed the tables.
+            name (str): The table's name.
+            table (np.ndarray): The table.
+        """
+        path = self._path(self.key(n, engine))
+        if not os.path.isdir(path) or any(
+            os.path.exists(os.path.join(path, name + kind))
+            for kind in (".npy", ".json")
+        ):
+            return
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        try:
+            saved = _save_table(tmp, name, table)
+            os.replace(os.path.join(tmp, saved), os.path.join(path, saved))
+        except FileNotFoundError:
+            pass  # the entry was evicted meanwhile
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Removes the least recently used entries until the cache fits in max_bytes.
+
+        Args:
+            keep (Optional[str]): An entry never to remove, such as the one just written.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = self._path(name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:
+                continue  # removed by another process
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # Rename first, so the entry disappears atomically for readers.
+            doomed = tempfile.mkdtemp(dir=self.directory, prefix=".evict-")
+            try:
+                os.rename(path, os.path.join(doomed, "entry"))
+            except OSError:
+                pass
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+def _save_table(directory: str, name: str, table: np.ndarray) -> str:
+    """Saves a table in directory, as .npy or, for arbitrary-precision integers, JSON.
+
+    Returns:
+        str: The file name it was saved as.
+    """
+    if table.dtype == object:
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump([_plain(x) for x in table.tolist()], f)
+        return f"{name}.json"
+    np.save(os.path.join(directory, f"{name}.npy"), table)
+    return f"{name}.npy"
+
+
+def _plain(value):
+    """Converts nested lists of NumPy scalars to plain Python values for JSON."""
+    if isinstance(value, list):
+        return [_plain(x) for x in value]
+    return int(value)
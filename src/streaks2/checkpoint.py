@@ -0,0 +1,95 @@
+"""
+This module saves and restores partial enumerations of permutations.
+A checkpoint records the rank of the last completed permutation together with
+the accumulators for every permutation before it, so a run can resume there.
+"""
+
+import os
+import tempfile
+from math import factorial
+from typing import Tuple
+
+import numpy as np
+
+from streaks2.accumulators import StreakAccumulators
+
+
+def save_checkpoint(path: str, accumulators: StreakAccumulators, stop: int) -> None:
+    """Saves the totals for the permutations with ranks below stop.
+
+    The file is written next to path and renamed over it, so a crash never leaves
+    a partial checkpoint behind.
+
+    Args:
+        path (str): The checkpoint file.
+        accumulators (StreakAccumulators): The totals so far.
+        stop (int): The rank after the last completed permutation.
+    """
+    write_arrays(path, stop=np.array(stop), **accumulators.to_arrays())
+
+
+def write_arrays(path: str, **arrays: np.ndarray) -> None:
+    """Writes arrays to an .npz file next to path and renames it over path.
+
+    Args:
+        path (str): The file to write.
+        **arrays (np.ndarray): The arrays, by name.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_checkpoint(path: str) -> Tuple[StreakAccumulators, int]:
+    """Loads a checkpoint written by `save_checkpoint`.
+
+    Args:
+        path (str): The checkpoint file.
+
+    Returns:
+        Tuple[StreakAccumulators, int]: The totals so far, and the rank to resume from.
+    """
+    with np.load(path) as arrays:
+        return StreakAccumulators.from_arrays(arrays), int(arrays["stop"])
+
+
+def accumulate_with_checkpoints(
+    n: int, path: str, every: int, instrument=None
+) -> StreakAccumulators:
+    """Accumulates streak statistics for all permutations of 1..n, resuming from and saving to a checkpoint.
+
+    Args:
+        n (int): The upper limit of the range of integers to permute.
+        path (str): The checkpoint file. It is left in place, holding the finished totals.
+        every (int): The number of permutations between checkpoints.
+        instrument (Optional[Instrumentation]): Where to report progress and phase times.
+
+    Returns:
+        StreakAccumulators: The totals for every permutation.
+    """
+    from streaks2.streaks import StreakStatistics
+
+    if every < 1:
+        raise ValueError("Checkpoints must be at least one permutation apart.")
+    if os.path.exists(path):
+        accumulators, done = load_checkpoint(path)
+        if accumulators.n != n:
+            raise ValueError(f"Checkpoint is for n={accumulators.n}, not n={n}.")
+    else:
+        accumulators, done = StreakAccumulators(n), 0
+
+    total = factorial(n)
+    if instrument is not None:
+        instrument.start(total, done)  # the rate counts only this session's work
+    while done < total:
+        stop = min(done + every, total)
+        StreakStatistics._accumulate_ranks(n, done, stop, accumulators, instrument)
+        done = stop
+        save_checkpoint(path, accumulators, done)
+    return accumulators
@@ -0,0 +1,261 @@
+"""
+This module computes streak statistics exactly, without enumerating permutations.
+Streak lengths of a permutation have the same distribution as its cycle lengths,
+so every table follows from closed forms over arbitrary-precision integers.
+"""
+
+from functools import cached_property
+from math import comb, factorial
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from streaks2.utils import SummaryIndex, add_summary_row_column
+
+SUM = SummaryIndex.SUM.value
+
+
+def factorials(n: int) -> list:
+    """Returns the factorials 0!, 1!, ..., n! as a list of Python integers."""
+    facts = [1] * (n + 1)
+    for i in range(1, n + 1):
+        facts[i] = facts[i - 1] * i
+    return facts
+
+
+def stirling_first(n: int) -> np.ndarray:
+    """Returns the unsigned Stirling numbers of the first kind, c(n, k) for k = 0..n.
+
+    c(n, k) is the number of permutations of n integers with exactly k streaks.
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Returns:
+        np.ndarray: An object array of Python integers, indexed by k.
+    """
+    row = np.zeros(n + 1, dtype=object)
+    row[0] = 1
+    for m in range(1, n + 1):
+        row[1 : m + 1] = row[0:m] + (m - 1) * row[1 : m + 1]
+        row[0] = 0
+    return row
+
+
+def streak_length_totals(n: int) -> np.ndarray:
+    """Returns the number of streaks of each length, n!/k, over all permutations."""
+    totals = np.zeros(n + 1, dtype=object)
+    nperms = factorial(n)
+    for length in range(1, n + 1):
+        totals[length] = nperms // length
+    return totals
+
+
+def start_length_counts(n: int) -> np.ndarray:
+    """Returns the number of streaks that start with s and have length k, over all permutations.
+
+    A streak starting with s has length k in (n-s)! (s-1)! C(n-k, s-1) permutations.
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Returns:
+        np.ndarray: An (n+1, n+1) object array indexed by [start, length].
+    """
+    facts = factorials(n)
+    counts = np.zeros((n + 1, n + 1), dtype=object)
+    for start in range(1, n + 1):
+        # Walk k upward, using C(m-1, r) = C(m, r) * (m-r) / m.
+        count = facts[n - start] * facts[start - 1] * comb(n - 1, start - 1)
+        for length in range(1, n - start + 2):
+            counts[start, length] = count
+            m = n - length
+            if m:
+                count = count * (m - start + 1) // m
+    return counts
+
+
+def lacking_length_counts(n: int) -> np.ndarray:
+    """Returns the number of permutations with no streak of each length k.
+
+    By inclusion-exclusion, this is the sum over j of (-1)**j n! / (k**j j!).
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Returns:
+        np.ndarray: An object array of Python integers, indexed by k.
+    """
+    absent = np.zeros(n + 1, dtype=object)
+    nperms = factorial(n)
+    for length in range(1, n + 1):
+        term, total = nperms, nperms
+        for j in range(1, n // length + 1):
+            term //= length * j
+            total += -term if j % 2 else term
+        absent[length] = total
+    return absent
+
+
+def lacking_lengths_count(n: int, lengths: Iterable[int]) -> int:
+    """Returns the number of permutations with no streak whose length is in lengths.
+
+    Let a[m] count the permutations of m with no forbidden cycle length. The cycle holding m
+    has j-1 other elements, in (m-1)!/(m-j)! orders, so a[m] sums (m-1)!/(m-j)! a[m-j] over
+    the allowed j. Scaled as c[m] = a[m] n!/m!, this is m c[m] = sum of c[m-j], with c[0] = n!:
+    a running total of every c[k], minus the few forbidden terms. Memory is O(n), and time is
+    O(n (|lengths| + 1)) big-integer additions.
+
+    Args:
+        n (int): The number of integers being permuted.
+        lengths (Iterable[int]): The forbidden streak lengths.
+
+    Returns:
+        int: The count, as a Python integer.
+    """
+    forbidden = sorted(set(lengths))
+    if forbidden and forbidden[0] < 1:
+        raise ValueError("Streak lengths must be positive.")
+    c = [factorial(n)] + [0] * n
+    running = 0  # c[0] + ... + c[m-1]
+    for m in range(1, n + 1):
+        running += c[m - 1]
+        total = running
+        for j in forbidden:
+            if j > m:
+                break
+            total -= c[m - j]
+        c[m] = total // m
+    return c[n]
+
+
+def count_longest_counts(n: int) -> np.ndarray:
+    """Returns the number of permutations with c streaks whose longest streak has length l.
+
+    Let T_l(m, c) count the permutations of m with c streaks, none longer than l. The cycle
+    holding m has some length j <= l, so T_l(m, c) sums (m-1)!/(m-j)! T_l(m-j, c-1) over j.
+    Scaled as v[m] = T_l(m, .) n!/m!, this is m v[m, c] = the sum of v[m-j, c-1] over a window
+    of the last l rows, kept as a running total. The table is T_l(n, c) - T_(l-1)(n, c).
+
+    A longest streak of l > n/2 is the only one that long, so those columns are simply
+    n!/(l (n-l)!) c(n-l, c-1), from the Stirling numbers of n-l.
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Returns:
+        np.ndarray: An (n+1, n+1) object array of Python integers, indexed by [c, l].
+    """
+    table = np.zeros((n + 1, n + 1), dtype=object)
+    if n == 0:
+        table[0, 0] = 1
+        return table
+    nperms = factorial(n)
+    half = n // 2
+    previous = np.zeros(n + 1, dtype=object)  # T_(l-1)(n, .)
+    for longest in range(1, half + 1):
+        v = np.zeros((n + 1, n + 1), dtype=object)
+        v[0, 0] = nperms
+        window = v[0].copy()  # v[m-l] + ... + v[m-1]
+        for m in range(1, n + 1):
+            v[m, 1 : m + 1] = window[:m] // m
+            window += v[m]
+            if m >= longest:
+                window -= v[m - longest]
+        table[:, longest] = v[n] - previous
+        previous = v[n]
+
+    stirling = np.zeros(n + 1, dtype=object)  # c(m, .), for m = n - l
+    stirling[0] = 1
+    for m in range(0, n - half):
+        if m:
+            stirling[1 : m + 1] = stirling[0:m] + (m - 1) * stirling[1 : m + 1]
+            stirling[0] = 0
+        longest = n - m
+        table[1 : m + 2, longest] = stirling[: m + 1] * (
+            nperms // (longest * factorial(m))
+        )
+    return table
+
+
+class ExactStreakTables:
+    """
+    Exact streak statistics for all permutations of the integers from 1 to n.
+
+    Provides the same summaries as `StreakAccumulators`, as arbitrary-precision integers.
+    """
+
+    def __init__(self, n: int):
+        """Initializes the tables for permutations of the integers from 1 to n.
+
+        Args:
+            n (int): The upper limit of the range of integers being permuted.
+        """
+        self.n = n
+        self.permutations = factorial(n)
+
+    def length_summary(self) -> np.ndarray:
+        """Returns the number of streaks of each length, with the total at SUM."""
+        summary = streak_length_totals(self.n)
+        summary[SUM] = sum(summary[1:])
+        return summary
+
+    @cached_property
+    def stirling(self) -> np.ndarray:
+        """The unsigned Stirling numbers of the first kind for n, computed on first access."""
+        return stirling_first(self.n)
+
+    def count_summary(self) -> np.ndarray:
+        """Returns the number of permutations with each streak count, with the total at SUM."""
+        summary = self.stirling.copy()
+        summary[SUM] = self.permutations
+        return summary
+
+    @cached_property
+    def sl(self) -> np.ndarray:
+        """The start-by-length table, computed on first access."""
+        return start_length_counts(self.n)
+
+    def sl_summary(self) -> np.ndarray:
+        """Returns the start-by-length table, with a summary row and column."""
+        return add_summary_row_column(self.sl)
+
+    def absent_summary(self) -> np.ndarray:
+        """Returns the number of permutations lacking each streak length, with the total at SUM."""
+        summary = lacking_length_counts(self.n)
+        summary[SUM] = sum(summary[1:])
+        return summary
+
+    def count_longest_summary(self) -> np.ndarray:
+        """Returns the count-by-longest-streak table, with a summary row and column."""
+        return add_summary_row_column(count_longest_counts(self.n))
+
+
+def sweep_tables(last: int) -> Iterator[ExactStreakTables]:
+    """Yields exact tables for n = 1, 2, ..., last, with the Stirling numbers of each
+    derived from the one before.
+
+    Every permutation of n comes from inserting n into a permutation of n-1, in one of
+    n places. At the front, n starts a new streak of length 1; anywhere else it joins
+    the streak it lands in. So c(n, k) = c(n-1, k-1) + (n-1) c(n-1, k).
+
+    The other tables are left to be computed on first access, as for a single n; deriving
+    the start-by-length table here would cost O(n**2) for every n, whether it is used or not.
+
+    Args:
+        last (int): The largest n.
+
+    Yields:
+        Iterator[ExactStreakTables]: The tables for each n, with the Stirling numbers
+            already filled in.
+    """
+    stirling = np.array([1], dtype=object)
+    for n in range(1, last + 1):
+        previous = stirling
+        stirling = np.zeros(n + 1, dtype=object)
+        stirling[1:] = previous
+        stirling[:n] += (n - 1) * previous
+
+        tables = ExactStreakTables(n)
+        tables.stirling = stirling
+        yield tables
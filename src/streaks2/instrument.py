@@ -0,0 +1,199 @@
+"""
+This module reports on long StreakStatistics runs while they happen.
+An `Instrumentation` object, passed as `StreakStatistics(n, instrument=...)`, calls
+back with progress, times each phase of the work, and can sample blocks of the
+enumeration into a cProfile or tracemalloc report. Without one, the enumeration
+loop runs exactly as before.
+"""
+
+import cProfile
+import io
+import math
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from fractions import Fraction
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from streaks2.batch import find_streaks_batch
+
+PHASES = ("generate", "decompose", "accumulate", "summarize")
+PROFILERS = ("cprofile", "tracemalloc")
+
+
+class Progress(NamedTuple):
+    """How far a run has got."""
+
+    done: int  # permutations processed
+    total: int  # permutations in the run
+    elapsed: float  # seconds since the run started
+    rate: float  # permutations per second
+    eta: Optional[float]  # estimated seconds remaining, once there is a rate
+
+
+def _to_float(value: Fraction) -> float:
+    """Converts value to a float, or to infinity if it is too large for one."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf
+
+
+class Instrumentation:
+    """
+    Progress reports, per-phase timers and optional profiling for one run.
+    """
+
+    def __init__(
+        self,
+        progress: Optional[Callable[[Progress], None]] = None,
+        interval: float = 1.0,
+        profile: Optional[str] = None,
+        sample_every: int = 1,
+    ):
+        """Initializes instrumentation for a run.
+
+        Args:
+            progress (Optional[Callable[[Progress], None]]): Called at most once per interval
+                while the run progresses, and once when it finishes.
+            interval (float): The minimum number of seconds between progress calls.
+            profile (Optional[str]): "cprofile" or "tracemalloc", to profile the enumeration.
+            sample_every (int): Profile one block of permutations in this many.
+        """
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profile}")
+        self.progress = progress
+        self.interval = interval
+        self.profile = profile
+        self.sample_every = sample_every
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.profiler = cProfile.Profile() if profile == "cprofile" else None
+        # Taken in the sampled block with the largest peak.
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+        self.blocks = 0
+        self.start(0)
+
+    def start(self, total: int, done: int = 0) -> None:
+        """Starts the progress clock for a run of total permutations, done of them already finished."""
+        self.total = total
+        self.done = done
+        self.started = self.last_report = time.perf_counter()
+        self._done_at_start = done
+
+    def advance(self, count: int) -> None:
+        """Records that count more permutations are finished, and reports progress if it is due."""
+        self.done += count
+        if self.progress is not None:
+            now = time.perf_counter()
+            if now - self.last_report >= self.interval:
+                self.last_report = now
+                self.progress(self.status(now))
+
+    def finish(self) -> None:
+        """Reports final progress."""
+        if self.progress is not None:
+            self.progress(self.status())
+
+    def status(self, now: Optional[float] = None) -> Progress:
+        """Returns the current progress.
+
+        Permutation counts can be far beyond float range, so the rate and ETA are worked out
+        exactly, and a rate too large for a float is reported as infinity.
+        """
+        elapsed = (time.perf_counter() if now is None else now) - self.started
+        processed = self.done - self._done_at_start
+        rate, eta = 0.0, None
+        if elapsed > 0 and processed > 0:
+            rate = _to_float(Fraction(processed) / Fraction(elapsed))
+            eta = _to_float(
+                Fraction(self.total - self.done) * Fraction(elapsed) / processed
+            )
+        return Progress(self.done, self.total, elapsed, rate, eta)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the with-block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    @contextmanager
+    def sampling(self) -> Iterator[None]:
+        """Profiles the with-block, if profiling is on and this block is one of the samples."""
+        sampled = self.profile is not None and self.blocks % self.sample_every == 0
+        self.blocks += 1
+        if not sampled:
+            yield
+            return
+        if self.profiler is not None:
+            self.profiler.enable()
+            try:
+                yield
+            finally:
+                self.profiler.disable()
+            return
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield
+            _, peak = tracemalloc.get_traced_memory()
+            if peak >= self.peak_bytes:
+                self.peak_bytes = peak
+                self.snapshot = tracemalloc.take_snapshot()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+    def report(self, limit: int = 10) -> str:
+        """Returns the phase times, the overall rate and, if profiling was on, its top entries."""
+        status = self.status()
+        lines = [
+            f"{name:12} {seconds:10.3f} s" for name, seconds in self.phases.items()
+        ]
+        lines.append(
+            f"{status.done} of {status.total} permutations, {status.rate:.0f}/s"
+        )
+        if self.profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats(
+                "cumulative"
+            ).print_stats(limit)
+            lines.append(out.getvalue())
+        elif self.snapshot is not None:
+            lines.append(
+                f"peak traced memory in a sampled block: {self.peak_bytes} bytes"
+            )
+            lines += [str(stat) for stat in self.snapshot.statistics("lineno")[:limit]]
+        return "\n".join(lines)
+
+
+def accumulate_blocks(
+    accumulators, blocks: Iterable[np.ndarray], instrument: Instrumentation
+) -> None:
+    """Adds blocks of permutations to accumulators, timing each phase of every block.
+
+    Args:
+        accumulators (StreakAccumulators): The totals to add to.
+        blocks (Iterable[np.ndarray]): (m, n) arrays of permutations.
+        instrument (Instrumentation): Where to record the times and progress.
+    """
+    blocks = iter(blocks)
+    while True:
+        with instrument.sampling():
+            with instrument.phase("generate"):
+                block = next(blocks, None)
+            if block is None:
+                return
+            with instrument.phase("decompose"):
+                starts, lengths, counts = find_streaks_batch(block)
+            with instrument.phase("accumulate"):
+                accumulators.add_streaks(len(block), starts, lengths, counts)
+        instrument.advance(len(block))
@@ -0,0 +1,62 @@
+"""
+This module spreads the enumeration of permutations across worker processes.
+The permutations are split by fixed prefixes; each worker returns only its small
+partial accumulators, which the parent merges.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations, repeat
+from typing import List, Tuple
+
+from streaks2.accumulators import StreakAccumulators
+
+# Aim for several prefixes per worker, so uneven workers even out.
+PREFIXES_PER_JOB = 4
+
+
+def prefixes(n: int, jobs: int) -> List[Tuple[int, ...]]:
+    """Splits the permutations of 1..n into groups that share a fixed prefix.
+
+    Args:
+        n (int): The upper limit of the range of integers to permute.
+        jobs (int): The number of worker processes the groups are for.
+
+    Returns:
+        List[Tuple[int, ...]]: The shortest prefixes that give at least
+            PREFIXES_PER_JOB groups per job, or every full permutation if there are too few.
+    """
+    groups = 1
+    depth = 0
+    while depth < n and groups < PREFIXES_PER_JOB * jobs:
+        groups *= n - depth
+        depth += 1
+    return list(permutations(range(1, n + 1), depth))
+
+
+def _accumulate_prefix(n: int, prefix: Tuple[int, ...]) -> StreakAccumulators:
+    """Accumulates streak statistics for the permutations that start with prefix."""
+    from streaks2.streaks import StreakStatistics
+
+    return StreakStatistics._accumulate(n, prefix)
+
+
+def parallel_accumulate(n: int, jobs: int, instrument=None) -> StreakAccumulators:
+    """Accumulates streak statistics for all permutations of 1..n in a process pool.
+
+    Args:
+        n (int): The upper limit of the range of integers to permute.
+        jobs (int): The number of worker processes.
+        instrument (Optional[Instrumentation]): Told of the progress as each group finishes.
+            Phase times and profiles stay in the workers.
+
+    Returns:
+        StreakAccumulators: The same totals as a serial pass over the permutations.
+    """
+    groups = prefixes(n, jobs)
+    accumulators = StreakAccumulators(n)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for partial in pool.map(_accumulate_prefix, repeat(n), groups):
+            accumulators.merge(partial)
+            if instrument is not None:
+                instrument.advance(partial.permutations)
+    return accumulators
@@ -0,0 +1,208 @@
+"""
+This module counts permutations by streak type: the partition of n formed by
+their streak lengths. Streak lengths have the same distribution as cycle lengths,
+so the number of permutations of type 1^m1 2^m2 ... is n! / prod(k**mk * mk!),
+and the whole histogram follows without enumerating permutations.
+
+For small n, `build_partition_index` also records which permutation ranks have each
+type, so those permutations can be looked up without rescanning.
+"""
+
+import os
+from math import factorial
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from streaks2.accumulators import streak_length_counts
+from streaks2.batch import find_streaks_batch
+from streaks2.utils import permutation_blocks
+
+Partition = Tuple[int, ...]
+
+# n! ranks are stored in the index; beyond this it is too large to be useful.
+MAX_INDEX_N = 10
+
+
+def partition_count(n: int, partition: Sequence[int]) -> int:
+    """Returns the number of permutations of 1..n whose streak lengths are partition.
+
+    Args:
+        n (int): The number of integers being permuted.
+        partition (Sequence[int]): Streak lengths, in any order.
+
+    Returns:
+        int: n! / prod(k**mk * mk!), where mk is the number of parts equal to k,
+            or 0 if partition is not a partition of n.
+    """
+    if sum(partition) != n or any(k < 1 for k in partition):
+        return 0
+    denominator = 1
+    multiplicity: Dict[int, int] = {}
+    for k in partition:
+        multiplicity[k] = multiplicity.get(k, 0) + 1
+        denominator *= k * multiplicity[k]
+    return factorial(n) // denominator
+
+
+def iter_partition_counts(n: int) -> Iterator[Tuple[Partition, int]]:
+    """Yields every partition of n with the number of permutations of that streak type.
+
+    Each partition lists its parts largest first. They come grouped by largest part, from (n,)
+    to (1, ..., 1). The denominator is built up one part at a time, so each partition
+    costs one big-integer division.
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Yields:
+        Iterator[Tuple[Partition, int]]: Each partition and its permutation count.
+    """
+    total = factorial(n)
+    parts: List[int] = []
+
+    def visit(remaining: int, largest: int, denominator: int):
+        if remaining == 0:
+            yield tuple(parts), total // denominator
+            return
+        for k in range(min(remaining, largest), 1, -1):
+            d = denominator
+            for m in range(1, remaining // k + 1):
+                parts.append(k)
+                d *= k * m
+                yield from visit(remaining - k * m, k - 1, d)
+            del parts[-(remaining // k) :]
+        parts.extend([1] * remaining)  # only ones are left
+        yield tuple(parts), total // (denominator * factorial(remaining))
+        del parts[-remaining:]
+
+    if n == 0:
+        yield (), 1
+        return
+    yield from visit(n, n, 1)
+
+
+def partition_histogram(n: int) -> Dict[Partition, int]:
+    """Returns the number of permutations of each streak type.
+
+    Args:
+        n (int): The number of integers being permuted.
+
+    Returns:
+        Dict[Partition, int]: Counts by partition, parts largest first. They add up to n!.
+    """
+    return dict(iter_partition_counts(n))
+
+
+def _type_keys(multiplicities: np.ndarray, n: int) -> np.ndarray:
+    """Encodes rows of part multiplicities, indexed by part size, as base n+1 integers."""
+    weights = (n + 1) ** np.arange(multiplicities.shape[1], dtype=np.int64)
+    return multiplicities.astype(np.int64) @ weights
+
+
+def _multiplicities(partition: Sequence[int], n: int) -> np.ndarray:
+    return np.bincount(np.asarray(partition, dtype=np.intp), minlength=n + 1)[: n + 1]
+
+
+class PartitionIndex:
+    """
+    The permutation ranks of each streak type, for the permutations of 1..n.
+
+    Ranks are lexicographic, as in `streaks2.utils.rank_permutation`.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        partitions: List[Partition],
+        offsets: np.ndarray,
+        ranks: np.ndarray,
+    ):
+        """Initializes an index.
+
+        Args:
+            n (int): The number of integers being permuted.
+            partitions (List[Partition]): Every partition of n, parts largest first.
+            offsets (np.ndarray): The ranks of partitions[i] are ranks[offsets[i]:offsets[i + 1]].
+            ranks (np.ndarray): Every rank, grouped by streak type.
+        """
+        self.n = n
+        self.partitions = partitions
+        self.offsets = offsets
+        self.ranks = ranks
+        self._position = {partition: i for i, partition in enumerate(partitions)}
+
+    def lookup(self, partition: Sequence[int]) -> np.ndarray:
+        """Returns the ranks of the permutations of streak type partition, in increasing order.
+
+        Args:
+            partition (Sequence[int]): Streak lengths, in any order.
+        """
+        i = self._position.get(tuple(sorted(partition, reverse=True)))
+        if i is None:
+            return np.zeros(0, dtype=self.ranks.dtype)
+        return self.ranks[self.offsets[i] : self.offsets[i + 1]]
+
+    def counts(self) -> Dict[Partition, int]:
+        """Returns the number of permutations of each streak type, from the index."""
+        return dict(zip(self.partitions, np.diff(self.offsets).tolist()))
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Saves the index as an .npz file."""
+        padded = np.zeros(
+            (len(self.partitions), max(self.n, 1)), dtype=np.min_scalar_type(self.n)
+        )
+        for i, partition in enumerate(self.partitions):
+            padded[i, : len(partition)] = partition
+        np.savez(
+            path,
+            n=np.array(self.n),
+            partitions=padded,
+            offsets=self.offsets,
+            ranks=self.ranks,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "PartitionIndex":
+        """Loads an index saved by `save`."""
+        with np.load(path) as data:
+            n = int(data["n"])
+            partitions = [tuple(int(k) for k in row if k) for row in data["partitions"]]
+            return cls(n, partitions, data["offsets"], data["ranks"])
+
+
+def build_partition_index(
+    n: int, path: Union[str, os.PathLike, None] = None
+) -> PartitionIndex:
+    """Finds the streak type of every permutation of 1..n and groups their ranks by type.
+
+    Args:
+        n (int): The number of integers being permuted, at most MAX_INDEX_N.
+        path (Union[str, os.PathLike, None]): If given, the index is also saved there.
+
+    Returns:
+        PartitionIndex: The ranks of each streak type.
+    """
+    if n > MAX_INDEX_N:
+        raise ValueError(f"Partition indexes are limited to n <= {MAX_INDEX_N}.")
+    partitions = [partition for partition, _ in iter_partition_counts(n)]
+    keys = _type_keys(np.array([_multiplicities(p, n) for p in partitions]), n)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    types = np.empty(factorial(n), dtype=np.min_scalar_type(len(partitions)))
+    done = 0
+    for block in permutation_blocks(n):
+        _, lengths, counts = find_streaks_batch(block)
+        multiplicities = streak_length_counts(lengths, counts, n + 1)
+        found = order[np.searchsorted(sorted_keys, _type_keys(multiplicities, n))]
+        types[done : done + len(block)] = found
+        done += len(block)
+
+    ranks = np.argsort(types, kind="stable").astype(np.min_scalar_type(factorial(n)))
+    offsets = np.zeros(len(partitions) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(types, minlength=len(partitions)))
+    index = PartitionIndex(n, partitions, offsets, ranks)
+    if path is not None:
+        index.save(path)
+    return index
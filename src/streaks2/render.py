@@ -0,0 +1,142 @@
+"""
+This module writes StreakStatistics tables as text or binary files.
+Rows are formatted a block at a time and written straight to a file-like object,
+so a table with millions of rows never has to exist as one string.
+"""
+
+import io
+import os
+import sys
+from typing import IO, Optional, Tuple, Union
+
+import numpy as np
+
+# Rows formatted per write.
+CHUNK_ROWS = 4096
+
+FORMATS = ("csv", "tsv", "npy")
+
+
+def wants_color(file: IO) -> bool:
+    """Decides whether output to file should be colored, following termcolor's conventions.
+
+    NO_COLOR or ANSI_COLORS_DISABLED turn color off, FORCE_COLOR turns it on, and
+    otherwise only terminals get color. In-memory buffers follow standard output.
+    """
+    if "NO_COLOR" in os.environ or "ANSI_COLORS_DISABLED" in os.environ:
+        return False
+    if "FORCE_COLOR" in os.environ:
+        return True
+    if isinstance(file, io.StringIO):
+        file = sys.stdout
+    isatty = getattr(file, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def _row_format(arr: np.ndarray) -> str:
+    """Returns the %-format for one cell of arr."""
+    return "%d" if arr.dtype.kind in "iub" or arr.dtype == object else "%s"
+
+
+def _row_formats(arr: np.ndarray, color: bool) -> Tuple[str, str]:
+    """Returns the %-formats of a summary row and of a body row of arr."""
+    cell = _row_format(arr)
+    if not color:
+        plain = (cell + " ") * arr.shape[1] + "\n"
+        return plain, plain
+    from termcolor import colored
+
+    # Color the format strings once, instead of every cell.
+    green = colored(cell, "green", force_color=True) + " "
+    red = colored(cell, "red", force_color=True) + " "
+    summary_row = red + green * (arr.shape[1] - 1) + "\n"
+    body_row = green + (cell + " ") * (arr.shape[1] - 1) + "\n"
+    return summary_row, body_row
+
+
+def write_rows(file: IO, rows: np.ndarray, color: bool, summary: bool = False) -> None:
+    """Writes the rows of a 2-D array, in blocks of CHUNK_ROWS, separated by spaces.
+
+    Args:
+        file (IO): A text file-like object.
+        rows (np.ndarray): A 2-D array whose column 0 is a summary column.
+        color (bool): Color the summary row and column.
+        summary (bool): Highlight the first row as the summary row.
+    """
+    summary_row, body_row = _row_formats(rows, color)
+    for lo in range(0, len(rows), CHUNK_ROWS):
+        block = rows[lo : lo + CHUNK_ROWS].tolist()
+        if lo == 0 and summary and block:
+            file.write(summary_row % tuple(block[0]))
+            block = block[1:]
+        file.write("".join(body_row % tuple(row) for row in block))
+
+
+def write_table(
+    arr: np.ndarray,
+    file: IO,
+    head: Optional[int] = None,
+    tail: Optional[int] = None,
+    color: Optional[bool] = None,
+) -> None:
+    """Writes a 2-D table, one line per row, with row 0 and column 0 highlighted as summaries.
+
+    Args:
+        arr (np.ndarray): A 2-D array with a summary row and column at index 0.
+        file (IO): A text file-like object.
+        head (Optional[int]): Write at most this many rows from the top.
+        tail (Optional[int]): Also write this many rows from the bottom, after a "..." line
+            if rows are skipped. With neither head nor tail, every row is written.
+        color (Optional[bool]): Color the summary row and column. Defaults to `wants_color(file)`.
+    """
+    if arr.ndim != 2:
+        raise ValueError("Input array must be 2-dimensional.")
+    if color is None:
+        color = wants_color(file)
+    top, bottom = head_tail_bounds(arr.shape[0], head, tail)
+    write_rows(file, arr[:top], color, summary=True)
+    if bottom > top:
+        file.write("...\n")
+    write_rows(file, arr[bottom:], color, summary=bottom == 0)
+
+
+def head_tail_bounds(
+    rows: int, head: Optional[int], tail: Optional[int]
+) -> Tuple[int, int]:
+    """Returns (top, bottom): head and tail write rows [0, top) and [bottom, rows).
+
+    With neither head nor tail, every row is in the top part.
+    """
+    if head is None and tail is None:
+        return rows, rows
+    top = min(head or 0, rows)
+    return top, max(top, rows - (tail or 0))
+
+
+def export_table(
+    arr: np.ndarray, file: Union[str, os.PathLike, IO], fmt: str = "csv"
+) -> None:
+    """Exports a 2-D table as CSV, TSV or a NumPy .npy file.
+
+    Args:
+        arr (np.ndarray): A 2-D array.
+        file (Union[str, os.PathLike, IO]): A path, or a file-like object (binary for npy).
+        fmt (str): "csv", "tsv" or "npy".
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if fmt == "npy":
+        np.save(file, arr, allow_pickle=arr.dtype == object)
+        return
+    delimiter = "," if fmt == "csv" else "\t"
+    cell = _row_format(arr)
+    row_format = delimiter.join([cell] * arr.shape[1]) + "\n"
+    close = isinstance(file, (str, os.PathLike))
+    out = open(file, "w") if close else file
+    try:
+        for lo in range(0, arr.shape[0], CHUNK_ROWS):
+            rows = arr[lo : lo + CHUNK_ROWS].tolist()
+            out.write("".join(row_format % tuple(row) for row in rows))
+    finally:
+        if close:
+            out.close()
@@ -0,0 +1,176 @@
+"""
+This module estimates streak statistics from random permutations.
+Permutations are drawn in vectorized batches, decomposed with `find_streaks_batch`,
+and the estimates are scaled to n! and reported with their standard errors.
+"""
+
+from fractions import Fraction
+from math import factorial
+from typing import Optional
+
+import numpy as np
+
+from streaks2.accumulators import StreakAccumulators
+from streaks2.batch import find_streaks_batch
+from streaks2.utils import SummaryIndex
+
+SUM = SummaryIndex.SUM.value
+
+# Aim for batches of about this many permutation elements.
+BATCH_ELEMENTS = 1 << 22
+
+
+def _scale(values: np.ndarray, nperms: int) -> np.ndarray:
+    """Multiplies per-permutation means by n!, falling back to Python integers past float range.
+
+    Non-finite values, such as the infinite standard errors of fewer than two samples,
+    are passed through unchanged.
+    """
+    try:
+        return values * float(nperms)
+    except OverflowError:
+        scaled = [
+            round(Fraction(v) * nperms) if np.isfinite(v) else v
+            for v in values.reshape(-1).tolist()
+        ]
+        return np.array(scaled, dtype=object).reshape(values.shape)
+
+
+def _stderr(total: np.ndarray, total_sq: np.ndarray, samples: int) -> np.ndarray:
+    """Returns the standard error of a mean from its running sum and sum of squares."""
+    if samples < 2:
+        return np.full(np.shape(total), np.inf)
+    mean = total / samples
+    variance = np.maximum(total_sq / samples - mean**2, 0) * samples / (samples - 1)
+    return np.sqrt(variance / samples)
+
+
+class SampledStreakTables:
+    """
+    Monte Carlo estimates of streak statistics for permutations of the integers from 1 to n.
+
+    Provides the same summaries as `StreakAccumulators`, estimated from uniform random
+    permutations and scaled to n!, along with their standard errors.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        samples: int,
+        seed: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        rtol: Optional[float] = None,
+    ):
+        """Draws random permutations and accumulates their streaks.
+
+        Args:
+            n (int): The upper limit of the range of integers to permute.
+            samples (int): The largest number of permutations to draw.
+            seed (Optional[int]): Seeds the random number generator, for reproducible runs.
+            batch_size (Optional[int]): Permutations drawn per batch.
+            rtol (Optional[float]): Stop early, after a batch, once every `by_length`
+                estimate has a relative standard error of at most rtol.
+        """
+        self.n = n
+        self.permutations = factorial(n)
+        self.samples = 0
+        width = n + 1
+        self._totals = StreakAccumulators(n)
+        # Sums of squares of the per-permutation values, for the standard errors.
+        self._lengths_sq = np.zeros(width, dtype=np.int64)
+        # Per-permutation totals behind the SUM entries, and their squares.
+        self._streaks = np.zeros(2, dtype=np.int64)
+        self._absent = np.zeros(2, dtype=np.int64)
+
+        if batch_size is None:
+            batch_size = max(1, BATCH_ELEMENTS // max(n, 1))
+        rng = np.random.default_rng(seed)
+        base = np.arange(1, width, dtype=np.min_scalar_type(n))
+        while self.samples < samples:
+            m = min(batch_size, samples - self.samples)
+            self._add_batch(rng.permuted(np.tile(base, (m, 1)), axis=1))
+            if rtol is not None and np.max(self._relative_error()) <= rtol:
+                break
+
+    def _add_batch(self, perms: np.ndarray) -> None:
+        """Adds the streaks of a batch of permutations to the running sums."""
+        m, n = perms.shape
+        starts, lengths, counts = find_streaks_batch(perms)
+        per_row = self._totals.add_streaks(m, starts, lengths, counts)
+        self.samples += m
+        self._lengths_sq += np.einsum("ij,ij->j", per_row, per_row)
+        self._streaks += [np.sum(counts), np.sum(counts.astype(np.int64) ** 2)]
+        absent = n - np.count_nonzero(per_row, axis=1)
+        self._absent += [np.sum(absent), np.sum(absent.astype(np.int64) ** 2)]
+
+    def _relative_error(self) -> np.ndarray:
+        """Returns the relative standard error of each `by_length` estimate."""
+        total = self._totals.lengths[1:]
+        stderr = _stderr(total, self._lengths_sq[1:], self.samples)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, stderr * self.samples / total, np.inf)
+
+    def _means(self, total: np.ndarray, sum_entry: int) -> np.ndarray:
+        means = total / max(self.samples, 1)
+        means[SUM] = sum_entry / max(self.samples, 1)
+        return means
+
+    def length_summary(self) -> np.ndarray:
+        """Returns the estimated number of streaks of each length, with the total at SUM."""
+        return _scale(
+            self._means(self._totals.lengths, self._streaks[0]), self.permutations
+        )
+
+    def length_stderr(self) -> np.ndarray:
+        """Returns the standard errors of `length_summary`."""
+        stderr = _stderr(self._totals.lengths, self._lengths_sq, self.samples)
+        stderr[SUM] = _stderr(self._streaks[0], self._streaks[1], self.samples)
+        return _scale(stderr, self.permutations)
+
+    def count_summary(self) -> np.ndarray:
+        """Returns the estimated number of permutations with each streak count, with n! at SUM."""
+        return _scale(self._means(self._totals.counts, self.samples), self.permutations)
+
+    def count_stderr(self) -> np.ndarray:
+        """Returns the standard errors of `count_summary`."""
+        stderr = _stderr(self._totals.counts, self._totals.counts, self.samples)
+        stderr[SUM] = 0.0
+        return _scale(stderr, self.permutations)
+
+    def sl_summary(self) -> np.ndarray:
+        """Returns the estimated start-by-length table, with a summary row and column."""
+        means = self._totals.sl / max(self.samples, 1)
+        means[SUM] = np.sum(means, axis=0)
+        means[:, SUM] = np.sum(means, axis=1)
+        means[SUM, SUM] = self._streaks[0] / max(self.samples, 1)
+        return _scale(means, self.permutations)
+
+    def sl_stderr(self) -> np.ndarray:
+        """Returns the standard errors of the interior of `sl_summary`, with zeros at SUM.
+
+        A start value begins at most one streak per permutation, so each cell is a proportion.
+        """
+        stderr = _stderr(self._totals.sl, self._totals.sl, self.samples)
+        stderr[SUM] = 0.0
+        stderr[:, SUM] = 0.0
+        return _scale(stderr, self.permutations)
+
+    def absent_summary(self) -> np.ndarray:
+        """Returns the estimated number of permutations lacking each streak length, with the total at SUM."""
+        absent = self.samples - self._totals.present
+        return _scale(self._means(absent, self._absent[0]), self.permutations)
+
+    def absent_stderr(self) -> np.ndarray:
+        """Returns the standard errors of `absent_summary`."""
+        absent = self.samples - self._totals.present
+        stderr = _stderr(absent, absent, self.samples)
+        stderr[SUM] = _stderr(self._absent[0], self._absent[1], self.samples)
+        return _scale(stderr, self.permutations)
+
+    def count_longest_summary(self) -> np.ndarray:
+        """Returns the estimated count-by-longest-streak table, with a summary row and column."""
+        means = self._totals.count_longest / max(self.samples, 1)
+        means[SUM] = np.sum(means, axis=0)
+        means[:, SUM] = np.sum(means, axis=1)
+        means[SUM, SUM] = self.samples / max(self.samples, 1)
+        return _scale(means, self.permutations)
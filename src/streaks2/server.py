@@ -0,0 +1,318 @@
+"""
+This module serves StreakStatistics tables over local HTTP, from one shared process.
+Results are kept in an in-memory LRU; concurrent requests for the same tables wait
+on a single computation, which runs in a process pool so the event loop stays free.
+Tables are also encoded there, once, so large responses are never built on the loop.
+
+    python -m streaks2.server [--host 127.0.0.1] [--port 8765] [--unix PATH]
+
+    GET /stats/N[?engine=exact]                 every table, as JSON
+    GET /stats/N/TABLE[?engine=...&format=npy]  one table, as JSON or NPY bytes
+    GET /health
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_ENTRIES = 64
+# The largest n a request may ask for, so that no request ties up a worker for minutes.
+# Enumerating 12! permutations takes about 2.5 minutes; the exact count-by-longest
+# table takes about 6 s at n = 300, and grows roughly as n**3.6.
+MAX_ENUMERATE_N = 12
+MAX_EXACT_N = 300
+
+# A table's JSON encoding, and its NPY encoding unless it holds arbitrary-precision integers.
+Encoded = Tuple[bytes, Optional[bytes]]
+Tables = Dict[str, Encoded]
+
+
+def _encode(table: np.ndarray) -> Encoded:
+    """Encodes a table as JSON and, if it has a fixed-width type, as NPY."""
+    encoded = json.dumps(table.tolist()).encode()
+    if table.dtype == object:
+        return encoded, None
+    buffer = io.BytesIO()
+    np.save(buffer, table, allow_pickle=False)
+    return encoded, buffer.getvalue()
+
+
+def compute_tables(n: int, engine: str, names: Iterable[str]) -> Tables:
+    """Computes and encodes the named summary tables of n with engine. Runs in a worker process."""
+    from streaks2.streaks import StreakStatistics
+
+    stats = StreakStatistics(n, engine=engine)
+    return {name: _encode(getattr(stats, name)) for name in names}
+
+
+class HTTPError(Exception):
+    """An error to report to the client, with its HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class StatsServer:
+    """
+    Computes, caches and serves the summary tables of StreakStatistics.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        executor: Optional[Executor] = None,
+    ):
+        """Initializes a server with an empty cache.
+
+        Args:
+            max_entries (int): The number of (n, engine) results kept in memory.
+            executor (Optional[Executor]): Where computations run. Defaults to a process pool
+                with one worker per CPU.
+        """
+        self.max_entries = max_entries
+        self.executor = ProcessPoolExecutor() if executor is None else executor
+        self.results: "OrderedDict[Tuple[int, str], Tables]" = OrderedDict()
+        self.pending: Dict[Tuple[int, str, Tuple[str, ...]], asyncio.Future] = {}
+        self.computations = 0  # how many computations have been started
+
+    async def tables(self, n: int, engine: str, names: Iterable[str]) -> Tables:
+        """Returns the named tables of n computed by engine, from the cache, a computation
+        already under way, or a new computation.
+
+        Only the missing tables are computed for the exact engine, whose LAZY_TABLES are
+        expensive. The other engines fill every table in one pass, so they compute all of
+        them, and every request for n shares that one computation.
+        """
+        from streaks2.streaks import StreakStatistics
+
+        names = tuple(names)
+        cached = self.results.get((n, engine), {})
+        missing = tuple(name for name in names if name not in cached)
+        if not missing:
+            self.results.move_to_end((n, engine))
+            return cached
+        if engine != "exact":
+            missing = StreakStatistics.TABLES
+        key = (n, engine, missing)
+        future = self._pending_covering(key)
+        if future is None:
+            self.computations += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor, compute_tables, n, engine, missing
+            )
+            self.pending[key] = future
+            future.add_done_callback(lambda done: self._store(key, done))
+        # Shielded, so one client disconnecting does not cancel the others' result.
+        computed = await asyncio.shield(future)
+        return {**cached, **computed}
+
+    def _pending_covering(
+        self, key: Tuple[int, str, Tuple[str, ...]]
+    ) -> Optional[asyncio.Future]:
+        """Returns a computation under way for the same n and engine that includes every table
+        of key, if there is one."""
+        n, engine, names = key
+        for (other_n, other_engine, other_names), future in self.pending.items():
+            if (other_n, other_engine) == (n, engine) and set(names) <= set(
+                other_names
+            ):
+                return future
+        return None
+
+    def _store(
+        self, key: Tuple[int, str, Tuple[str, ...]], future: asyncio.Future
+    ) -> None:
+        del self.pending[key]
+        if future.cancelled() or future.exception() is not None:
+            return  # not cached; the next request tries again
+        n, engine, _ = key
+        self.results.setdefault((n, engine), {}).update(future.result())
+        self.results.move_to_end((n, engine))
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    async def respond(self, target: str) -> Tuple[int, str, bytes]:
+        """Answers one GET request.
+
+        Args:
+            target (str): The request path and query string.
+
+        Returns:
+            Tuple[int, str, bytes]: The status, content type and body.
+        """
+        from streaks2.streaks import StreakStatistics
+
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"]:
+            return 200, "application/json", b'{"status": "ok"}'
+        if not parts or parts[0] != "stats" or len(parts) not in (2, 3):
+            raise HTTPError(404, f"Not found: {url.path}")
+        try:
+            n = int(parts[1])
+        except ValueError:
+            raise HTTPError(400, f"n must be an integer, not {parts[1]!r}.") from None
+        engine = query.get("engine", "enumerate")
+        _check_request(n, engine)
+
+        if len(parts) == 2:
+            tables = await self.tables(n, engine, StreakStatistics.TABLES)
+            body = json.dumps({"n": n, "engine": engine}).encode()[:-1]
+            body += b"".join(
+                b", " + json.dumps(name).encode() + b": " + tables[name][0]
+                for name in StreakStatistics.TABLES
+            )
+            return 200, "application/json", body + b"}"
+        name = parts[2]
+        if name not in StreakStatistics.TABLES:
+            raise HTTPError(404, f"Unknown table: {name}")
+        fmt = query.get("format", "json")
+        if fmt not in ("json", "npy"):
+            raise HTTPError(400, f"Unknown format: {fmt}")
+        encoded_json, encoded_npy = (await self.tables(n, engine, (name,)))[name]
+        if fmt == "json":
+            return 200, "application/json", encoded_json
+        if encoded_npy is None:
+            raise HTTPError(
+                406, "This table holds arbitrary-precision integers; use JSON."
+            )
+        return 200, "application/octet-stream", encoded_npy
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves one HTTP/1.1 connection, one request at a time."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = True
+                while True:  # headers
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if (
+                        name.strip().lower() == "connection"
+                        and value.strip().lower() == "close"
+                    ):
+                        keep_alive = False
+                try:
+                    words = request_line.decode("latin-1").split()
+                    if len(words) < 2:
+                        raise HTTPError(400, "Malformed request line.")
+                    method, target = words[:2]
+                    if method != "GET":
+                        raise HTTPError(405, f"Method not allowed: {method}")
+                    status, content_type, body = await self.respond(target)
+                except HTTPError as error:
+                    status, content_type = error.status, "application/json"
+                    body = json.dumps({"error": str(error)}).encode()
+                except Exception as error:  # a failed computation; keep serving
+                    status, content_type = 500, "application/json"
+                    body = json.dumps({"error": repr(error)}).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix: Optional[str] = None,
+    ) -> asyncio.AbstractServer:
+        """Starts listening on a TCP port, or on a Unix socket if unix is given."""
+        if unix is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self) -> None:
+        """Shuts down the worker pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    406: "Not Acceptable",
+    500: "Internal Server Error",
+}
+
+
+def _check_request(n: int, engine: str) -> None:
+    """Rejects requests for unknown engines, or too large to compute."""
+    from streaks2.streaks import StreakStatistics
+
+    if engine not in StreakStatistics.ENGINES:
+        raise HTTPError(400, f"Unknown engine: {engine}")
+    limit = MAX_EXACT_N if engine == "exact" else MAX_ENUMERATE_N
+    if not 0 <= n <= limit:
+        raise HTTPError(
+            400, f"n must be in the range 0 to {limit} for the {engine} engine."
+        )
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix: Optional[str] = None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    workers: Optional[int] = None,
+) -> None:
+    """Runs a server until it is cancelled."""
+    server = StatsServer(max_entries, ProcessPoolExecutor(workers))
+    listener = await server.start(host, port, unix)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m streaks2.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument(
+        "--workers", type=int, help="worker processes; defaults to one per CPU"
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.unix, args.max_entries, args.workers)
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
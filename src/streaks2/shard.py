@@ -0,0 +1,216 @@
+"""
+This module splits one enumeration of permutations into shards that can run anywhere.
+Shard i of k covers a contiguous range of lexicographic ranks and writes its
+accumulators, with the range they cover, to a small self-describing .npz file.
+Merging checks that a set of shard files covers every rank exactly once.
+
+    python -m streaks2.shard run N INDEX SHARDS OUTPUT [--every PERMUTATIONS]
+    python -m streaks2.shard merge OUTPUT SHARD...
+"""
+
+import argparse
+import os
+import sys
+from math import factorial
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from streaks2.accumulators import StreakAccumulators
+from streaks2.checkpoint import write_arrays
+from streaks2.utils import rank_ranges
+
+KIND = "streaks2-shard"
+FORMAT = 1
+
+
+class Shard(NamedTuple):
+    """The accumulators for the permutations with ranks from start up to done."""
+
+    n: int
+    start: int
+    stop: int  # the rank the shard is to reach
+    done: int  # the rank it has reached
+    accumulators: StreakAccumulators
+
+    @property
+    def complete(self) -> bool:
+        return self.done == self.stop
+
+
+def save_shard(path: str, shard: Shard) -> None:
+    """Writes a shard file, atomically."""
+    write_arrays(
+        path,
+        kind=np.array(KIND),
+        format=np.array(FORMAT),
+        start=np.array(shard.start),
+        stop=np.array(shard.stop),
+        done=np.array(shard.done),
+        **shard.accumulators.to_arrays(),
+    )
+
+
+def load_shard(path: str) -> Shard:
+    """Reads a shard file written by `save_shard`.
+
+    Raises:
+        ValueError: If the file is not a shard file of a known format.
+    """
+    with np.load(path) as arrays:
+        if "kind" not in arrays or str(arrays["kind"]) != KIND:
+            raise ValueError(f"{path} is not a shard file.")
+        if int(arrays["format"]) != FORMAT:
+            raise ValueError(
+                f"{path} has shard format {int(arrays['format'])}, not {FORMAT}."
+            )
+        accumulators = StreakAccumulators.from_arrays(arrays)
+        return Shard(
+            accumulators.n,
+            int(arrays["start"]),
+            int(arrays["stop"]),
+            int(arrays["done"]),
+            accumulators,
+        )
+
+
+def run_shard(
+    n: int,
+    index: int,
+    shards: int,
+    path: str,
+    every: Optional[int] = None,
+    instrument=None,
+) -> Shard:
+    """Accumulates streak statistics for shard index of shards, and writes them to path.
+
+    If path already holds an unfinished run of the same shard, it resumes from there.
+
+    Args:
+        n (int): The upper limit of the range of integers to permute.
+        index (int): Which shard, from 0 to shards - 1.
+        shards (int): The number of shards the permutations are split into.
+        path (str): The shard file.
+        every (Optional[int]): Save progress after every this many permutations,
+            so an interrupted shard resumes. Defaults to saving only at the end.
+        instrument (Optional[Instrumentation]): Where to report progress and phase times.
+
+    Returns:
+        Shard: The finished shard.
+
+    Raises:
+        ValueError: If index is out of range, every is below 1, or path holds
+            a different shard.
+    """
+    from streaks2.streaks import StreakStatistics
+
+    if not 0 <= index < shards:
+        raise ValueError("Shard index must be in the range 0 to shards - 1.")
+    if every is not None and every < 1:
+        raise ValueError("Checkpoints must be at least one permutation apart.")
+    start, stop = rank_ranges(n, shards)[index]
+    shard = Shard(n, start, stop, start, StreakAccumulators(n))
+    if os.path.exists(path):
+        saved = load_shard(path)
+        if (saved.n, saved.start, saved.stop) != (n, start, stop):
+            raise ValueError(f"{path} holds a different shard.")
+        shard = saved
+
+    done = shard.done
+    if instrument is not None:
+        instrument.start(stop - start, done - start)
+    step = stop - start if every is None else every
+    while done < stop:
+        end = min(done + step, stop)
+        StreakStatistics._accumulate_ranks(n, done, end, shard.accumulators, instrument)
+        done = end
+        save_shard(path, shard._replace(done=done))
+    if start == stop:
+        save_shard(path, shard)  # an empty range still gets a file, so merging finds it
+    if instrument is not None:
+        instrument.finish()
+    return shard._replace(done=done)
+
+
+def merge_shards(shards: Iterable[Shard], complete: bool = True) -> Shard:
+    """Combines shards into one, checking that their ranges neither overlap nor leave gaps.
+
+    Args:
+        shards (Iterable[Shard]): Finished shards, for the same n, in any order.
+        complete (bool): Require the shards to cover every permutation. Otherwise they
+            need only cover one contiguous range, and the result can be merged again.
+
+    Returns:
+        Shard: A shard covering the union of the ranges.
+
+    Raises:
+        ValueError: If a shard is unfinished, the shards are for different n, or their
+            ranges overlap or leave a gap.
+    """
+    shards = sorted(shards, key=lambda shard: shard.start)
+    if not shards:
+        raise ValueError("There are no shards to merge.")
+    n = shards[0].n
+    accumulators = StreakAccumulators(n)
+    position = shards[0].start
+    for shard in shards:
+        if shard.n != n:
+            raise ValueError(f"Shards are for different n: {n} and {shard.n}.")
+        if not shard.complete:
+            raise ValueError(
+                f"Shard for ranks {shard.start} to {shard.stop} is unfinished."
+            )
+        if shard.start < position:
+            raise ValueError(f"Shards overlap at rank {shard.start}.")
+        if shard.start > position:
+            raise ValueError(f"Ranks {position} to {shard.start} are missing.")
+        accumulators.merge(shard.accumulators)
+        position = shard.stop
+    start = shards[0].start
+    if complete and (start, position) != (0, factorial(n)):
+        raise ValueError(
+            f"Shards cover ranks {start} to {position}, not 0 to {factorial(n)}."
+        )
+    return Shard(n, start, position, position, accumulators)
+
+
+def merge_shard_files(paths: Iterable[str], complete: bool = True) -> Shard:
+    """Loads and merges shard files. See `merge_shards`."""
+    return merge_shards((load_shard(path) for path in paths), complete)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m streaks2.shard")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="accumulate one shard")
+    run.add_argument("n", type=int)
+    run.add_argument("index", type=int)
+    run.add_argument("shards", type=int)
+    run.add_argument("output")
+    run.add_argument(
+        "--every", type=int, help="save progress after this many permutations"
+    )
+    merge = commands.add_parser("merge", help="combine shard files")
+    merge.add_argument("output")
+    merge.add_argument("shard", nargs="+")
+    merge.add_argument(
+        "--partial",
+        action="store_true",
+        help="allow a contiguous range short of every rank",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "run":
+            run_shard(args.n, args.index, args.shards, args.output, args.every)
+            return 0
+        merged = merge_shard_files(args.shard, complete=not args.partial)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    save_shard(args.output, merged)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
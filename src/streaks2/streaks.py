@@ -3,27 +3,77 @@ This module contains classes for working with streaks of integers.
 It provides functionality to represent, analyze, and generate statistics about streaks in permutations.
 """
 
-from itertools import permutations
+import io
+from array import array
+from functools import cached_property
 from math import factorial
-from typing import Generator, List
+from typing import (
+    IO,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
-from termcolor import colored
 
+from streaks2.accumulators import StreakAccumulators, streak_length_counts
+from streaks2.batch import find_streaks_batch
+from streaks2.exact import ExactStreakTables, lacking_lengths_count
 from streaks2.utils import (
     SummaryIndex,
     add_summary_row_column,
     invert_zeros_and_nonzeros,
+    permutation_blocks,
+    rank_permutation,
 )
 
 SUM = SummaryIndex.SUM.value
 
+# Permutations handed to the batch kernels at a time.
+BLOCK_SIZE = 1 << 16
+
+
+def _add_blocks(
+    accumulators: StreakAccumulators, blocks: Iterable[np.ndarray], instrument=None
+) -> None:
+    """Adds blocks of permutations to accumulators, through the instrumentation if there is any."""
+    if instrument is None:
+        for block in blocks:
+            accumulators.add_batch(block)
+        return
+    from streaks2.instrument import accumulate_blocks
+
+    accumulate_blocks(accumulators, blocks, instrument)
+
+
+def _typecode(seq: Sequence[int]) -> str:
+    """Returns the smallest signed array typecode that holds seq and offsets into it."""
+    lo = min(seq, default=0)
+    hi = max(max(seq, default=0), len(seq))
+    if -0x80 <= lo and hi < 0x80:
+        return "b"
+    if -0x8000 <= lo and hi < 0x8000:
+        return "h"
+    if -0x80000000 <= lo and hi < 0x80000000:
+        return "i"
+    return "q"
+
 
 class Streak:
     """
     Represents a single streak of integers.
+
+    A Streak is a view onto a slice of a sequence, so the streaks of a `Streaks` object
+    share its one backing array instead of each holding a copy.
     """
 
+    __slots__ = ("_seq", "_start", "_stop")
+
     def __init__(self, seq: List[int]):
         """Initializes a Streak object.
 
@@ -34,14 +84,33 @@ class Streak:
         if seq:
             if min(seq) != seq[0]:
                 raise ValueError("Streak must start with the smallest element.")
-        self.streak = seq
+        self._seq = seq
+        self._start = 0
+        self._stop = len(seq)
+
+    @classmethod
+    def _view(cls, seq: Sequence[int], start: int, stop: int) -> "Streak":
+        """Creates a Streak over seq[start:stop] without copying or validating it.
+
+        Only for callers that already guarantee seq[start] is the smallest element of the slice.
+        """
+        streak = cls.__new__(cls)
+        streak._seq = seq
+        streak._start = start
+        streak._stop = stop
+        return streak
+
+    @property
+    def streak(self) -> List[int]:
+        """The integers in the streak."""
+        return list(self._seq[self._start : self._stop])
 
     def __repr__(self) -> str:
         return f"Streak({self.streak})"
 
     def __len__(self) -> int:
         """Returns the number of integers in the streak."""
-        return len(self.streak)
+        return self._stop - self._start
 
     def __eq__(self, other: "Streak") -> bool:
         """
@@ -59,8 +128,13 @@ class Streak:
 class Streaks:
     """
     Represents a collection of Streak objects, decomposed from an integer sequence.
+
+    The sequence and the offsets at which its streaks start share one compact backing
+    array, of the smallest integer type that fits; Streak views are made on demand.
     """
 
+    __slots__ = ("_data", "_size")
+
     def __init__(self, seq: List[int]):
         """Initializes a Streaks object by decomposing a sequence of integers into streaks.
 
@@ -69,7 +143,36 @@ class Streaks:
         """
         if len(seq) != len(set(seq)):
             raise ValueError("Sequence must contain distinct elements.")
-        self.streaks = self._find_streaks(seq)
+        offsets = self._find_offsets(seq)
+        self._size = len(seq)
+        try:
+            self._data = array(_typecode(seq), seq)
+            self._data.fromlist(offsets)
+        except (OverflowError, TypeError):
+            # Integers beyond 64 bits, or non-integers, keep a plain list.
+            self._data = list(seq) + offsets
+
+    @staticmethod
+    def _find_offsets(seq: Sequence[int]) -> List[int]:
+        """Finds where each streak of a sequence starts.
+
+        Args:
+            seq (Sequence[int]): A sequence of distinct integers.
+
+        Returns:
+            List[int]: The index at which each streak starts, followed by len(seq).
+        """
+        if len(seq) == 0:
+            return [0]
+
+        offsets = [0]
+        streak_start = seq[0]
+        for i in range(1, len(seq)):
+            if seq[i] < streak_start:
+                offsets.append(i)
+                streak_start = seq[i]
+        offsets.append(len(seq))
+        return offsets
 
     def _find_streaks(self, seq: List[int]) -> List[Streak]:
         """Decomposes a list of integers into streaks.
@@ -78,45 +181,47 @@ class Streaks:
             seq (List[int]): A sequence of distinct integers.
 
         Returns:
-            List[Streak]: A list of Streak objects.
+            List[Streak]: A list of Streak objects, viewing slices of seq.
         """
-        if not seq:
-            return []
-
-        streaks = []
-        current_streak = [seq[0]]
-
-        for i in range(1, len(seq)):
-            if seq[i] >= current_streak[0]:
-                current_streak.append(seq[i])
-            else:
-                streaks.append(Streak(current_streak))
-                current_streak = [seq[i]]
-
-        streaks.append(Streak(current_streak))
-        return streaks
+        offsets = self._find_offsets(seq)
+        return [
+            Streak._view(seq, offsets[i], offsets[i + 1])
+            for i in range(len(offsets) - 1)
+        ]
+
+    @property
+    def streaks(self) -> List[Streak]:
+        """The streaks, as views onto the backing array."""
+        offsets = self._data[self._size :]
+        return [
+            Streak._view(self._data, offsets[i], offsets[i + 1])
+            for i in range(len(offsets) - 1)
+        ]
 
     def __repr__(self) -> str:
         return f"Streaks({self.streaks})"
 
     def __len__(self) -> int:
         """Returns the number of streaks in the Streaks object."""
-        return len(self.streaks)
+        return len(self._data) - self._size - 1
 
     @classmethod
     def generate_streaks_for_all_permutations(
-        cls, n: int
+        cls, n: int, start: int = 0, stop: Optional[int] = None
     ) -> Generator["Streaks", None, None]:
         """Generates Streaks objects for every permutation of the integers from 1 to n (inclusive).
 
         Args:
             n (int): The upper limit of the range of integers to permute.
+            start (int): The lexicographic rank of the first permutation.
+            stop (Optional[int]): The rank after the last permutation. Defaults to n!.
 
         Yields:
             Generator["Streaks", None, None]: A Streaks object for each permutation.
         """
-        for perm in permutations(range(1, n + 1)):
-            yield cls(perm)
+        for block in permutation_blocks(n, start, stop):
+            for perm in block.tolist():
+                yield cls(perm)
 
 
 class KvStreaks:
@@ -157,6 +262,13 @@ class KvStreaks:
 
         self.kv_streaks[int(streak_start)] = streak_length
 
+    @classmethod
+    def _from_kv_streaks(cls, kv_streaks: Dict[int, int]) -> "KvStreaks":
+        """Creates a KvStreaks object from streak lengths already found, without rescanning a sequence."""
+        streaks = cls.__new__(cls)
+        streaks.kv_streaks = kv_streaks
+        return streaks
+
     def __repr__(self) -> str:
         return f"KvStreaks({self.kv_streaks})"
 
@@ -166,18 +278,21 @@ class KvStreaks:
 
     @classmethod
     def generate_kv_streaks_for_all_permutations(
-        cls, n: int
+        cls, n: int, start: int = 0, stop: Optional[int] = None
     ) -> Generator["KvStreaks", None, None]:
         """Generates KvStreaks objects for every permutation of the integers from 1 to n (inclusive).
 
         Args:
             n (int): The upper limit of the range of integers to permute.
+            start (int): The lexicographic rank of the first permutation.
+            stop (Optional[int]): The rank after the last permutation. Defaults to n!.
 
         Yields:
             Generator["KvStreaks", None, None]: A KvStreaks object for each permutation.
         """
-        for perm in permutations(range(1, n + 1)):
-            yield cls(perm)
+        for block in permutation_blocks(n, start, stop):
+            for perm in block.tolist():
+                yield cls(perm)
 
 
 class StreakStatistics:
@@ -187,64 +302,367 @@ class StreakStatistics:
     across all permutations of a given range of integers.
     """
 
-    def __init__(self, n: int):
+    ENGINES = ("enumerate", "exact", "plain-changes")
+
+    def __init__(
+        self,
+        n: int,
+        engine: str = "enumerate",
+        jobs: int = 1,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = 1_000_000,
+        cache=None,
+        instrument=None,
+    ):
         """Initializes a StreakStatistics object for permutations of integers from 1 to n.
 
+        The "enumerate" engine fills every table in a single pass over the permutations.
+        The "exact" engine computes them from closed forms, as arbitrary-precision integers,
+        without listing permutations. The "plain-changes" engine walks the permutations by
+        adjacent swaps and updates the tables incrementally, in pure Python, so it is slower
+        than "enumerate". The per-permutation matrix, `streaks_arr`, is only built if it
+        is asked for.
+
         Args:
             n (int): The upper limit of the range of integers to permute.
+            engine (str): How to compute the statistics: "enumerate", "exact" or "plain-changes".
+            jobs (int): The number of worker processes the "enumerate" engine splits
+                the permutations across. 1 runs in this process.
+            checkpoint (Optional[str]): A file in which the "enumerate" engine saves its
+                partial totals, so an interrupted run resumes where it stopped.
+            checkpoint_every (int): The number of permutations between checkpoints.
+            cache: A `ResultCache`, or the directory of one, to load the tables from
+                or store them in.
+            instrument (Optional[Instrumentation]): Reports progress and times each phase
+                of the run. See `streaks2.instrument`.
+
+        Raises:
+            ValueError: If engine is unknown, jobs or checkpoint are given for an engine
+                that does not support them, or together, or checkpoint_every is below 1.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine != "enumerate" and (jobs > 1 or checkpoint is not None):
+            raise ValueError(
+                f"jobs and checkpoint are only supported by the enumerate engine, not {engine}."
+            )
+        if jobs > 1 and checkpoint is not None:
+            raise ValueError("jobs and checkpoint cannot be combined.")
+        if checkpoint_every < 1:
+            raise ValueError("Checkpoints must be at least one permutation apart.")
+        if cache is not None:
+            from streaks2.cache import ResultCache, StoredStreakTables
+
+            if not isinstance(cache, ResultCache):
+                cache = ResultCache(cache)
+            stored = cache.get(n, engine)
+            if stored is not None:
+                tables = StoredStreakTables(
+                    stored, lambda: self._compute_tables(n, engine, 1, None, 0)
+                )
+                self._set_tables(n, engine, tables)
+                self._cache = cache
+                return
+        if instrument is None:
+            tables = self._compute_tables(n, engine, jobs, checkpoint, checkpoint_every)
+            self._set_tables(n, engine, tables)
+        else:
+            instrument.start(factorial(n))
+            tables = self._compute_tables(
+                n, engine, jobs, checkpoint, checkpoint_every, instrument
+            )
+            with instrument.phase("summarize"):
+                self._set_tables(n, engine, tables)
+            instrument.finish()
+        if cache is not None:
+            cache.put(n, engine, self._tables_to_store())
+            self._cache = cache
+
+    @classmethod
+    def _compute_tables(
+        cls,
+        n: int,
+        engine: str,
+        jobs: int,
+        checkpoint: Optional[str],
+        checkpoint_every: int,
+        instrument=None,
+    ):
+        """Runs an engine, returning its accumulators."""
+        if engine in ("exact", "plain-changes"):
+            if instrument is None:
+                return cls._compute_closed(n, engine)
+            # These engines have no blocks to report on; time them as a whole.
+            with instrument.phase("accumulate"):
+                tables = cls._compute_closed(n, engine)
+            instrument.advance(factorial(n))
+        elif jobs > 1:
+            from streaks2.parallel import parallel_accumulate
+
+            tables = parallel_accumulate(n, jobs, instrument)
+        elif checkpoint is not None:
+            from streaks2.checkpoint import accumulate_with_checkpoints
+
+            tables = accumulate_with_checkpoints(
+                n, checkpoint, checkpoint_every, instrument
+            )
+        else:
+            tables = cls._accumulate(n, instrument=instrument)
+        return tables
+
+    @staticmethod
+    def _compute_closed(n: int, engine: str):
+        """Runs the "exact" or "plain-changes" engine."""
+        if engine == "exact":
+            return ExactStreakTables(n)
+        from streaks2.plain_changes import accumulate_plain_changes
+
+        return accumulate_plain_changes(n)
+
+    def _set_tables(self, n: int, engine: str, tables) -> None:
+        """Fills the summary tables from an engine's accumulators."""
         self.n = n
-        self.streaks_arr = self._find_streaks_arr(n)
-        self.sl_streak_counts = self._sl_streak_counts(n)
-        self.counts = self._streak_counts()
+        self.engine = engine
+        self._tables = tables
+        self.length_counts = tables.length_summary()
+        self.counts = tables.count_summary()
+        self.absent_counts = tables.absent_summary()
+        self._cache = None
+
+    @classmethod
+    def sweep(cls, last: int) -> Iterator["StreakStatistics"]:
+        """Yields exact statistics for every n from 1 to last.
+
+        The streak counts of each n are derived from those of the one before, and the
+        start-by-length and count-by-longest tables are only computed if they are used.
+        That makes a sweep cheaper than computing each n separately, but the other
+        tables are still computed from scratch for every n.
+
+        Args:
+            last (int): The largest n.
+
+        Yields:
+            Iterator[StreakStatistics]: Statistics with engine "exact", for n = 1, 2, ..., last.
+        """
+        from streaks2.exact import sweep_tables
+
+        for tables in sweep_tables(last):
+            stats = cls.__new__(cls)
+            stats._set_tables(tables.n, "exact", tables)
+            yield stats
+
+    @classmethod
+    def from_shards(cls, paths: Iterable[str]) -> "StreakStatistics":
+        """Builds statistics from shard files that together cover every permutation.
+
+        Args:
+            paths (Iterable[str]): Files written by `streaks2.shard.run_shard`, in any order.
 
-    def _find_streaks_arr(self, n: int) -> np.ndarray:
-        """Calculates and summarizes streak lengths for all permutations.
+        Returns:
+            StreakStatistics: The same statistics as the "enumerate" engine.
+        """
+        from streaks2.shard import merge_shard_files
+
+        shard = merge_shard_files(paths)
+        stats = cls.__new__(cls)
+        stats._set_tables(shard.n, "enumerate", shard.accumulators)
+        return stats
+
+    # The summary tables, by attribute name.
+    TABLES = (
+        "length_counts",
+        "counts",
+        "sl_streak_counts",
+        "absent_counts",
+        "count_longest_counts",
+    )
+    # Tables the exact engine computes from scratch, and only when they are first used.
+    LAZY_TABLES = ("sl_streak_counts", "count_longest_counts")
+
+    def tables(self) -> Dict[str, np.ndarray]:
+        """Returns the summary tables, by attribute name, computing any not yet computed."""
+        return {name: getattr(self, name) for name in self.TABLES}
+
+    @classmethod
+    def sample(
+        cls,
+        n: int,
+        samples: int = 100_000,
+        seed: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        rtol: Optional[float] = None,
+    ) -> "StreakStatistics":
+        """Estimates the statistics from uniform random permutations, for n too large to enumerate.
+
+        Estimates are scaled to n!. Their standard errors are in `length_stderr`,
+        `count_stderr` and `absent_stderr`, and `sl_stderr()` for the start-by-length table;
+        estimate +/- 1.96 * stderr is an approximate 95% confidence interval.
 
         Args:
             n (int): The upper limit of the range of integers to permute.
+            samples (int): The largest number of permutations to draw.
+            seed (Optional[int]): Seeds the random number generator, for reproducible runs.
+            batch_size (Optional[int]): Permutations drawn per vectorized batch.
+            rtol (Optional[float]): Stop early once every `by_length` estimate has a
+                relative standard error of at most rtol.
 
         Returns:
-            np.ndarray: A NumPy array summarizing the streak lengths.
+            StreakStatistics: Statistics with engine "sample".
+        """
+        from streaks2.sampling import SampledStreakTables
+
+        tables = SampledStreakTables(n, samples, seed, batch_size, rtol)
+        stats = cls.__new__(cls)
+        stats._set_tables(n, "sample", tables)
+        stats.samples = tables.samples
+        stats.length_stderr = tables.length_stderr()
+        stats.count_stderr = tables.count_stderr()
+        stats.absent_stderr = tables.absent_stderr()
+        return stats
+
+    def sl_stderr(self) -> np.ndarray:
+        """Returns the standard errors of a sampled start-by-length table."""
+        if self.engine != "sample":
+            raise ValueError(
+                "Standard errors are only available for sampled statistics."
+            )
+        return self._tables.sl_stderr()
+
+    def _tables_to_store(self) -> Dict[str, np.ndarray]:
+        """Returns the tables to put in the cache when they have just been computed.
+
+        The accumulating engines already hold every table, so all are stored. The exact
+        engine stores its LAZY_TABLES only if they have been used; the others are added
+        to the entry when they are first computed.
         """
-        lengths = self._streak_lengths(n)
-        return add_summary_row_column(lengths)
+        if self.engine != "exact":
+            return self.tables()
+        computed = vars(self)
+        return {name: computed[name] for name in self.TABLES if name in computed}
+
+    def _lazy_table(self, name: str, summarize) -> np.ndarray:
+        """Computes a table on first use, adding it to this run's cache entry, if there is one."""
+        table = summarize()
+        if self._cache is not None:
+            self._cache.add(self.n, self.engine, name, table)
+        return table
+
+    @cached_property
+    def sl_streak_counts(self) -> np.ndarray:
+        """The number of streaks by start and length, with a summary row and column."""
+        return self._lazy_table("sl_streak_counts", self._tables.sl_summary)
+
+    @cached_property
+    def count_longest_counts(self) -> np.ndarray:
+        """The number of permutations by streak count and longest streak, with a summary row and column."""
+        return self._lazy_table(
+            "count_longest_counts", self._tables.count_longest_summary
+        )
+
+    @staticmethod
+    def _accumulate(
+        n: int, prefix: Tuple[int, ...] = (), instrument=None
+    ) -> StreakAccumulators:
+        """Accumulates streak statistics for the permutations of integers from 1 to n.
+
+        Args:
+            n (int): The upper limit of the range of integers to permute.
+            prefix (Tuple[int, ...]): Only permutations that start with prefix are included.
+            instrument (Optional[Instrumentation]): Where to report progress and phase times.
+
+        Returns:
+            StreakAccumulators: The totals for those permutations.
+        """
+        # The permutations that start with prefix have consecutive ranks.
+        rest = [i for i in range(1, n + 1) if i not in prefix]
+        start = rank_permutation(tuple(prefix) + tuple(rest))
+        stop = start + factorial(len(rest))
+        return StreakStatistics._accumulate_ranks(n, start, stop, instrument=instrument)
+
+    @staticmethod
+    def _accumulate_ranks(
+        n: int,
+        start: int,
+        stop: int,
+        accumulators: Optional[StreakAccumulators] = None,
+        instrument=None,
+    ) -> StreakAccumulators:
+        """Accumulates streak statistics for the permutations with lexicographic ranks from start up to stop.
+
+        Args:
+            n (int): The upper limit of the range of integers to permute.
+            start (int): The rank of the first permutation.
+            stop (int): The rank after the last permutation.
+            accumulators (Optional[StreakAccumulators]): Totals to add to. Defaults to new ones.
+            instrument (Optional[Instrumentation]): Where to report progress and phase times.
+
+        Returns:
+            StreakAccumulators: The totals, including those permutations.
+        """
+        if accumulators is None:
+            accumulators = StreakAccumulators(n)
+        _add_blocks(
+            accumulators, permutation_blocks(n, start, stop, BLOCK_SIZE), instrument
+        )
+        return accumulators
+
+    @cached_property
+    def streak_rows(self) -> np.ndarray:
+        """The streak lengths of every permutation, one row per permutation, with the streak count in column 0.
+
+        No entry exceeds n, so the rows are stored in the smallest unsigned type that fits.
+        """
+        return self._streak_lengths(self.n)
+
+    @cached_property
+    def _rows_summary(self) -> np.ndarray:
+        """The column sums of `streak_rows`: the summary row of `streaks_arr`."""
+        return np.sum(self.streak_rows, axis=0, dtype=np.int64)
+
+    @cached_property
+    def streaks_arr(self) -> np.ndarray:
+        """The streak lengths of every permutation, one row per permutation, with a summary row and column.
+
+        Only the summary row needs a wide type, but the whole array gets it, so this is
+        eight times the size of `streak_rows`. It is assembled from `streak_rows` and its
+        column sums on first access; use `streak_rows` when the summary row is not needed.
+        """
+        rows = self.streak_rows
+        arr = np.empty((len(rows) + 1, rows.shape[1]), dtype=self._rows_summary.dtype)
+        arr[SUM] = self._rows_summary
+        arr[1:] = rows
+        return arr
 
     def _streak_lengths(self, n: int) -> np.ndarray:
-        """Calculates the streak lengths for all permutations of integers from 1 to n."""
-        length_counts = np.zeros((factorial(n) + 1, n + 1), dtype=int)
+        """Calculates the streak lengths for all permutations of integers from 1 to n.
+
+        Returns:
+            np.ndarray: An (n!, n + 1) array; [r, k] is the number of streaks of length k
+                in the permutation of rank r, and [r, 0] is its number of streaks.
+        """
+        length_counts = np.zeros((factorial(n), n + 1), dtype=np.min_scalar_type(n))
         perm_num = 0
-        for kv_streaks in KvStreaks.generate_kv_streaks_for_all_permutations(n):
-            perm_num += 1
-            streaks = kv_streaks.kv_streaks
-            for streak_length in streaks.values():
-                length_counts[perm_num, streak_length] += 1
+        for rows in self._row_blocks(n, 0, factorial(n)):
+            length_counts[perm_num : perm_num + len(rows)] = rows
+            perm_num += len(rows)
         return length_counts
 
-    def _streak_counts(self) -> np.ndarray:
-        """Counts the number of permutations with each streak count."""
-        counts = np.zeros(self.n + 1, dtype=int)
-        for i in range(1, factorial(self.n) + 1):
-            counts[self.streaks_arr[i, SUM]] += 1
-        counts[SUM] = sum(counts)
-        return counts
-
-    def _sl_streak_counts(self, n: int) -> np.ndarray:
-        counts = np.zeros((n + 1, n + 1), dtype=int)
-        for kv_streaks in KvStreaks.generate_kv_streaks_for_all_permutations(n):
-            streaks = kv_streaks.kv_streaks
-            for start, length in streaks.items():
-                counts[start, length] += 1
-        counts[SUM] = np.sum(counts, axis=0)
-        counts[:, SUM] = np.sum(counts, axis=1)
-        counts[SUM, SUM] = np.sum(counts[1:, 1:])
-        return counts
+    @staticmethod
+    def _row_blocks(n: int, start: int, stop: int) -> Iterator[np.ndarray]:
+        """Yields the rows of `streak_rows` for the permutations with ranks from start up to stop,
+        a block at a time, without building the rest."""
+        dtype = np.min_scalar_type(n)
+        for block in permutation_blocks(n, start, stop, BLOCK_SIZE):
+            _, lengths, counts = find_streaks_batch(block)
+            rows = streak_length_counts(lengths, counts, n + 1, dtype)
+            rows[:, SUM] = counts
+            yield rows
 
     def by_length(self) -> np.ndarray:
         """
         Returns the number of streaks by length.
         """
-        return self.streaks_arr[SUM, 1:]
+        return self.length_counts[1:]
 
     def by_count(self) -> np.ndarray:
         """
@@ -252,11 +670,17 @@ class StreakStatistics:
         """
         return self.counts[1:]
 
+    def by_longest(self) -> np.ndarray:
+        """
+        The number of permutations whose longest streak has each length.
+        """
+        return self.count_longest_counts[SUM, 1:]
+
     def of_length(self, length: int) -> int:
         """
         Returns the number of streaks of a given length.
         """
-        return self.streaks_arr[SUM, length]
+        return self.length_counts[length]
 
     def of_count(self, count: int) -> int:
         """
@@ -264,29 +688,108 @@ class StreakStatistics:
         """
         return self.counts[count]
 
+    def by_type(self) -> Dict[Tuple[int, ...], int]:
+        """
+        Returns the number of permutations of each streak type: the partition of n
+        formed by their streak lengths, largest first.
+        """
+        from streaks2.partitions import partition_histogram
+
+        return partition_histogram(self.n)
+
     def _streak_length_absent(self) -> np.ndarray:
         """Inverts zeros and nonzeros in the streaks array and summarizes the result."""
         absent = invert_zeros_and_nonzeros(self.streaks_arr)
         return add_summary_row_column(absent)
 
     def missing_streak_lengths(self) -> int:
-        """Calculates the number of missing streak lengths."""
-        return self._streak_length_absent()[0]
+        """Calculates the number of permutations lacking each streak length."""
+        return self.absent_counts
+
+    def missing_streak_length_set(self, lengths: Iterable[int]) -> int:
+        """Calculates the number of permutations lacking every streak length in a set.
+
+        The count is exact for every engine, and needs only O(n) memory.
+
+        Args:
+            lengths (Iterable[int]): The streak lengths that must all be absent.
+
+        Returns:
+            int: The number of permutations with no streak of any of those lengths.
+        """
+        return lacking_lengths_count(self.n, lengths)
 
     def __repr__(self) -> str:
-        """Returns a string representation of the StreakStatistics object."""
-        return f"StreakStatistics(n={self.n}, streaks_arr={self.streaks_arr})"
+        """Returns a string representation of the StreakStatistics object, from its summary tables."""
+        return f"StreakStatistics(n={self.n}, engine={self.engine!r}, length_counts={self.length_counts})"
+
+    def write(
+        self,
+        file: IO,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        summary_only: Optional[bool] = None,
+        color: Optional[bool] = None,
+    ) -> None:
+        """Writes the streaks array to a file, a block of rows at a time.
+
+        Rows are generated as they are written, so only the rows asked for are computed.
+
+        Args:
+            file (IO): A text file-like object.
+            head (Optional[int]): Write at most this many rows from the top.
+            tail (Optional[int]): Also write this many rows from the bottom.
+            summary_only (Optional[bool]): Write only the summary row, without enumerating
+                permutations. Defaults to True for every engine but "enumerate".
+            color (Optional[bool]): Color the summary row and column. Defaults to color on terminals only.
+        """
+        from streaks2.render import head_tail_bounds, wants_color, write_rows
+
+        if summary_only is None:
+            summary_only = self.engine != "enumerate"
+        if color is None:
+            color = wants_color(file)
+        summary = np.asarray(self.length_counts).reshape(1, -1)
+        if summary_only:
+            write_rows(file, summary, color, summary=True)
+            return
+        # Table row i is the summary for i == 0, and the permutation of rank i - 1 otherwise.
+        total = factorial(self.n)
+        top, bottom = head_tail_bounds(total + 1, head, tail)
+        if top:
+            write_rows(file, summary, color, summary=True)
+        for rows in self._row_blocks(self.n, 0, max(top - 1, 0)):
+            write_rows(file, rows, color)
+        if bottom > top:
+            file.write("...\n")
+        if bottom == 0:
+            write_rows(file, summary, color, summary=True)
+        for rows in self._row_blocks(self.n, max(bottom - 1, 0, top - 1), total):
+            write_rows(file, rows, color)
+
+    def export(
+        self, file, fmt: str = "csv", summary_only: Optional[bool] = None
+    ) -> None:
+        """Exports the streaks array as CSV, TSV or a NumPy .npy file.
+
+        Args:
+            file: A path, or a file-like object (binary for npy).
+            fmt (str): "csv", "tsv" or "npy".
+            summary_only (Optional[bool]): Export only the summary row, without enumerating
+                permutations. Defaults to True for every engine but "enumerate".
+        """
+        from streaks2.render import export_table
+
+        if summary_only is None:
+            summary_only = self.engine != "enumerate"
+        if summary_only:
+            export_table(np.asarray(self.length_counts).reshape(1, -1), file, fmt)
+        else:
+            export_table(self.streaks_arr, file, fmt)
 
     def __str__(self) -> str:
-        """Prints the array with arr[0] and arr[:, 0] in green using termcolor."""
-        s = ""
-        for i in range(self.streaks_arr.shape[0]):
-            for j in range(self.streaks_arr.shape[1]):
-                if i == 0 and j == 0:
-                    s += colored(f"{self.streaks_arr[i, j]}", "red") + " "
-                elif i == 0 or j == 0:
-                    s += colored(f"{self.streaks_arr[i, j]}", "green") + " "
-                else:
-                    s += f"{self.streaks_arr[i, j]} "
-            s += "\n"
-        return s
+        """Returns the streaks array as text, or only its summary row for engines other than
+        "enumerate", with arr[0] and arr[:, 0] colored when standard output is a terminal."""
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue()
@@ -0,0 +1,277 @@
+"""
+This module decomposes sequences too large to hold in memory into streaks.
+Input is read in fixed-size chunks, from an iterator, an array, a memory-mapped
+array or a binary file; the current streak is carried across chunk boundaries,
+so memory use does not grow with the length of the sequence. `StreakTracker`
+does the same one element at a time, for sequences that arrive live.
+"""
+
+import os
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from streaks2.utils import SummaryIndex
+
+SUM = SummaryIndex.SUM.value
+
+CHUNK_SIZE = 1 << 20
+
+Source = Union[Iterable[int], np.ndarray, str, os.PathLike]
+
+
+def iter_chunks(
+    source: Source, chunk_size: int = CHUNK_SIZE, dtype=np.int64
+) -> Iterator[np.ndarray]:
+    """Reads a sequence of integers in chunks.
+
+    Args:
+        source (Source): An iterable of integers, a 1-D array (including np.memmap),
+            or the path of a raw binary file of integers.
+        chunk_size (int): The number of integers per chunk.
+        dtype: The integer type of a binary file.
+
+    Yields:
+        Iterator[np.ndarray]: Consecutive chunks of at most chunk_size integers.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = np.memmap(source, dtype=dtype, mode="r")
+    if isinstance(source, np.ndarray):
+        if source.ndim != 1:
+            raise ValueError("Input array must be 1-dimensional.")
+        for i in range(0, len(source), chunk_size):
+            yield source[i : i + chunk_size]
+        return
+    iterator = iter(source)
+    while True:
+        chunk = np.fromiter(islice(iterator, chunk_size), dtype=np.int64)
+        if chunk.size == 0:
+            return
+        yield chunk
+
+
+class DistinctnessBitmap:
+    """
+    One bit per possible value, for checking that a stream of integers has no repeats.
+    """
+
+    def __init__(self, min_value: int = 0, max_value: Optional[int] = None):
+        """Initializes an empty bitmap.
+
+        Args:
+            min_value (int): The smallest value the stream may hold.
+            max_value (Optional[int]): The largest value, if known. Otherwise the bitmap
+                grows as larger values arrive.
+        """
+        self.min_value = min_value
+        size = 0 if max_value is None else (max_value - min_value) // 8 + 1
+        self.bits = np.zeros(size, dtype=np.uint8)
+
+    def add(self, values: np.ndarray) -> None:
+        """Marks values as seen.
+
+        Args:
+            values (np.ndarray): Integers not seen before.
+
+        Raises:
+            ValueError: If a value was seen before, or repeats within values.
+        """
+        if values.size == 0:
+            return
+        offsets = values.astype(np.int64) - self.min_value
+        if offsets.min() < 0:
+            raise ValueError(f"Values must be at least {self.min_value}.")
+        needed = int(offsets.max()) // 8 + 1
+        if needed > self.bits.size:
+            self.bits = np.concatenate(
+                (self.bits, np.zeros(needed - self.bits.size, dtype=np.uint8))
+            )
+        byte, bit = offsets >> 3, (1 << (offsets & 7)).astype(np.uint8)
+        repeated = np.any(self.bits[byte] & bit)
+        if not repeated and offsets.size > 1:
+            ordered = np.sort(offsets)
+            repeated = np.any(ordered[1:] == ordered[:-1])
+        if repeated:
+            raise ValueError("Sequence must contain distinct elements.")
+        np.bitwise_or.at(self.bits, byte, bit)
+
+
+def stream_streaks(
+    source: Source,
+    chunk_size: int = CHUNK_SIZE,
+    dtype=np.int64,
+    check_distinct: bool = True,
+    min_value: int = 0,
+    max_value: Optional[int] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Decomposes a sequence into streaks, one chunk at a time.
+
+    Uses the rule of `KvStreaks`: a new streak starts at each element smaller than
+    the start of the current streak.
+
+    Args:
+        source (Source): An iterable of integers, a 1-D array (including np.memmap),
+            or the path of a raw binary file of integers.
+        chunk_size (int): The number of integers read at a time.
+        dtype: The integer type of a binary file.
+        check_distinct (bool): Check, with a `DistinctnessBitmap`, that no value repeats.
+        min_value (int): The smallest value the sequence may hold, for the bitmap.
+        max_value (Optional[int]): The largest value, if known, for the bitmap.
+
+    Yields:
+        Iterator[Tuple[np.ndarray, np.ndarray]]: The first elements and lengths of the
+            streaks completed in each chunk, in order. The last streak comes last.
+    """
+    bitmap = DistinctnessBitmap(min_value, max_value) if check_distinct else None
+    start, length = None, 0  # the streak still open at the end of the last chunk
+    for chunk in iter_chunks(source, chunk_size, dtype):
+        chunk = np.asarray(chunk, dtype=np.int64)
+        if bitmap is not None:
+            bitmap.add(chunk)
+        # The smallest value before each element: the start of the streak it would join.
+        before = np.empty_like(chunk)
+        before[0] = np.iinfo(np.int64).max if start is None else start
+        np.minimum.accumulate(chunk[:-1], out=before[1:])
+        np.minimum(before[1:], before[0], out=before[1:])
+        positions = np.flatnonzero(chunk < before)
+
+        if positions.size == 0:
+            length += chunk.size
+            yield np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+            continue
+        starts = chunk[positions[:-1]]
+        lengths = np.diff(positions)
+        if start is not None:
+            starts = np.concatenate(([start], starts))
+            lengths = np.concatenate(([length + positions[0]], lengths))
+        yield starts, lengths
+        start, length = int(chunk[positions[-1]]), chunk.size - int(positions[-1])
+
+    if start is not None:
+        yield np.array([start], dtype=np.int64), np.array([length], dtype=np.int64)
+
+
+def stream_streak_histogram(source: Source, **kwargs) -> np.ndarray:
+    """Counts the streaks of each length in a sequence, one chunk at a time.
+
+    Args:
+        source (Source): An iterable of integers, a 1-D array (including np.memmap),
+            or the path of a raw binary file of integers.
+        **kwargs: Passed to `stream_streaks`.
+
+    Returns:
+        np.ndarray: The number of streaks of each length, with the total at SUM.
+    """
+    histogram = np.zeros(1, dtype=np.int64)
+    for _, lengths in stream_streaks(source, **kwargs):
+        if lengths.size == 0:
+            continue
+        counts = np.bincount(lengths)
+        if counts.size > histogram.size:
+            counts[: histogram.size] += histogram
+            histogram = counts
+        else:
+            histogram[: counts.size] += counts
+    histogram[SUM] = np.sum(histogram[1:])
+    return histogram
+
+
+class StreakTracker:
+    """
+    Tracks the streaks of a sequence as its elements arrive, one at a time.
+
+    Uses the rule of `KvStreaks`: a new streak starts at each element smaller than
+    the start of the current streak. Each element costs O(1). Only a repeat of the
+    current streak's first element is caught; use `DistinctnessBitmap` for a full check.
+    """
+
+    def __init__(self):
+        """Initializes a tracker for an empty sequence."""
+        self.completed = {}  # finished streak lengths, by first element
+        self.histogram = Counter()  # finished streaks, by length
+        self.start = None  # the first element of the current streak
+        self.length = 0  # the length of the current streak
+        self.elements = 0
+
+    def push(self, x: int) -> None:
+        """Appends one element to the sequence.
+
+        Args:
+            x (int): The next element.
+        """
+        x = int(x)
+        if self.start is not None and x > self.start:
+            self.length += 1
+        else:
+            if x == self.start:
+                raise ValueError("Sequence must contain distinct elements.")
+            if self.start is not None:
+                self.completed[self.start] = self.length
+                self.histogram[self.length] += 1
+            self.start, self.length = x, 1
+        self.elements += 1
+
+    def extend(self, batch: Iterable[int]) -> None:
+        """Appends a batch of elements to the sequence.
+
+        Args:
+            batch (Iterable[int]): The next elements, in order.
+        """
+        for x in batch:
+            self.push(x)
+
+    def __len__(self) -> int:
+        """Returns the number of streaks so far, including the current one."""
+        return len(self.completed) + (self.start is not None)
+
+    @property
+    def current_streak(self) -> Optional[Tuple[int, int]]:
+        """The first element and length of the current streak, or None if nothing has arrived."""
+        return None if self.start is None else (self.start, self.length)
+
+    def length_counts(self) -> Dict[int, int]:
+        """Returns the number of streaks of each length so far, including the current one."""
+        counts = dict(self.histogram)
+        if self.start is not None:
+            counts[self.length] = counts.get(self.length, 0) + 1
+        return counts
+
+    def snapshot(self):
+        """Returns the streaks so far as a `KvStreaks` object, without rescanning the sequence."""
+        from streaks2.streaks import KvStreaks
+
+        kv_streaks = dict(self.completed)
+        if self.start is not None:
+            kv_streaks[self.start] = self.length
+        return KvStreaks._from_kv_streaks(kv_streaks)
+
+    def to_dict(self) -> dict:
+        """Returns the tracker's state as plain, JSON-serializable data."""
+        return {
+            "completed": [[start, length] for start, length in self.completed.items()],
+            "start": self.start,
+            "length": self.length,
+            "elements": self.elements,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "StreakTracker":
+        """Restores a tracker from the data returned by `to_dict`.
+
+        Args:
+            state (dict): A tracker's saved state.
+
+        Returns:
+            StreakTracker: A tracker that continues where the saved one stopped.
+        """
+        tracker = cls()
+        tracker.completed = {
+            int(start): int(length) for start, length in state["completed"]
+        }
+        tracker.histogram = Counter(tracker.completed.values())
+        tracker.start = state["start"]
+        tracker.length = state["length"]
+        tracker.elements = state["elements"]
+        return tracker
@@ -1,9 +1,13 @@
 from enum import Enum
+from functools import lru_cache
+from itertools import permutations
+from math import factorial
+from typing import Generator, List, Optional, Sequence, Tuple
 
 import numpy as np
-import sympy
 
-GAMMA = float(sympy.S.EulerGamma)
+# The Euler-Mascheroni constant, float(sympy.S.EulerGamma), without importing sympy.
+GAMMA = 0.5772156649015329
 
 
 class SummaryIndex(Enum):
@@ -32,7 +36,10 @@ def add_summary_row_column(arr: np.ndarray) -> np.ndarray:
     column_sums = np.sum(arr[1:, :], axis=0)
     row_sums = np.sum(arr[:, 1:], axis=1)
 
-    result = np.zeros_like(arr)  # Create a new array
+    dtype = arr.dtype
+    if dtype.kind in "iu" and dtype.itemsize < np.dtype(int).itemsize:
+        dtype = np.dtype(int)  # Sums of small integer types need room to grow
+    result = np.zeros(arr.shape, dtype=dtype)  # Create a new array
     result[1:, 1:] = arr[1:, 1:]
     result[0, :] = column_sums
     result[:, 0] = row_sums
@@ -97,3 +104,309 @@ def random_permutation(n: int) -> np.ndarray:
     0 to n-1.
     """
     return np.random.permutation(n)
+
+
+def random_streak_lengths(
+    n: int, size: int, rng: Optional["np.random.Generator"] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample the streak lengths of random permutations of n integers, without building the permutations.
+
+    Position j of a uniform random permutation starts a streak (is a left-to-right minimum)
+    with probability 1/j, independently of every other position. Given a streak start at j,
+    the next one is beyond k with probability j/k, so it can be drawn with one uniform
+    variate, and each sample costs O(number of streaks), about ln(n).
+
+    Args:
+        n (int): The length of the permutations.
+        size (int): The number of permutations to sample.
+        rng (Optional[np.random.Generator]): The random number generator to use.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The streak lengths of every sample, listed sample by
+            sample in the order the streaks occur, and the number of streaks in each sample.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(size, dtype=np.int64)
+
+    active = np.arange(size)
+    position = np.ones(size)
+    rows, lengths = [], []
+    while active.size:
+        u = 1.0 - rng.random(active.size)  # uniform on (0, 1]
+        current = position[active]
+        following = np.minimum(np.floor(current / u) + 1, n + 1)
+        rows.append(active)
+        lengths.append((following - current).astype(np.int64))
+        position[active] = following
+        active = active[following <= n]
+
+    rows = np.concatenate(rows)
+    order = np.argsort(rows, kind="stable")
+    return np.concatenate(lengths)[order], np.bincount(rows, minlength=size)
+
+
+def random_streak_counts(
+    n: int, size: int, rng: Optional["np.random.Generator"] = None
+) -> np.ndarray:
+    """
+    Sample the number of streaks in random permutations of n integers.
+
+    Args:
+        n (int): The length of the permutations.
+        size (int): The number of permutations to sample.
+        rng (Optional[np.random.Generator]): The random number generator to use.
+
+    Returns:
+        np.ndarray: The number of streaks in each sample.
+    """
+    return random_streak_lengths(n, size, rng)[1]
+
+
+@lru_cache(maxsize=8)
+def _new_streak_probabilities(n: int) -> np.ndarray:
+    """
+    Tabulate c(j-1, k-1) / c(j, k) for j, k up to n, from the unsigned Stirling numbers of the
+    first kind, computed as logarithms so that large n neither overflows nor needs big integers.
+
+    Among the permutations of 1..j with k cycles, this is the fraction in which j is a cycle
+    of its own, since c(j, k) = c(j-1, k-1) + (j-1) c(j-1, k).
+    """
+    log_c = np.full((n + 1, n + 1), -np.inf)
+    log_c[0, 0] = 0.0
+    for j in range(1, n + 1):
+        log_grow = np.log(j - 1) + log_c[j - 1, 1:] if j > 1 else np.full(n, -np.inf)
+        log_c[j, 1:] = np.logaddexp(log_c[j - 1, :-1], log_grow)
+    probabilities = np.zeros((n + 1, n + 1))
+    with np.errstate(invalid="ignore"):
+        ratio = np.exp(log_c[:-1, :-1] - log_c[1:, 1:])
+    probabilities[1:, 1:] = np.where(np.isfinite(log_c[1:, 1:]), ratio, 0.0)
+    return probabilities
+
+
+def random_permutations_with_streaks(
+    n: int, k: int, size: int, rng: Optional["np.random.Generator"] = None
+) -> np.ndarray:
+    """
+    Sample permutations of the integers from 1 to n, uniformly among those with exactly k streaks.
+
+    First a permutation with k cycles is drawn. Going from j = n down to 1, j is a cycle of
+    its own with probability c(j-1, k'-1) / c(j, k'), where k' cycles are still to be placed.
+    Then, going up, every other j is inserted after a uniformly chosen smaller element,
+    in a linked list of successors. Writing each cycle from its smallest element, with
+    the cycles in decreasing order of those elements, gives a permutation whose streaks
+    are exactly those cycles (Foata's transformation). Every step is a whole-array
+    operation across the samples, so each sample costs O(n), whatever k is.
+
+    Args:
+        n (int): The length of the permutations.
+        k (int): The number of streaks, from 1 to n.
+        size (int): The number of permutations to sample.
+        rng (Optional[np.random.Generator]): The random number generator to use.
+
+    Returns:
+        np.ndarray: A (size, n) array, one permutation per row, of the smallest unsigned
+            type that holds n.
+    """
+    if n == 0 and k == 0:
+        return np.zeros((size, 0), dtype=np.uint8)
+    if not 1 <= k <= n:
+        raise ValueError("Streak count must be in the range 1 to n.")
+    rng = np.random.default_rng() if rng is None else rng
+    probabilities = _new_streak_probabilities(n)
+    rows = np.arange(size)
+    uniform = rng.random((n + 1, size))
+
+    # Which elements start a cycle, deciding from n down.
+    starts = np.zeros((n + 1, size), dtype=bool)
+    remaining = np.full(size, k)
+    for j in range(n, 0, -1):
+        starts[j] = uniform[j] < probabilities[j, remaining]
+        remaining -= starts[j]
+
+    # The cycles, as successor links, inserting from 1 up.
+    successor = np.zeros((n + 1, size), dtype=np.intp)
+    uniform = rng.random((n + 1, size))
+    for j in range(1, n + 1):
+        after = (uniform[j] * (j - 1)).astype(np.intp) + 1  # uniform on 1..j-1
+        joins = ~starts[j]
+        successor[j] = np.where(joins, successor[after, rows], j)
+        successor[after[joins], rows[joins]] = j
+
+    # Read the cycles out, from the largest cycle start down.
+    largest_start = np.maximum.accumulate(starts * np.arange(n + 1)[:, None], axis=0)
+    perms = np.empty((size, n), dtype=np.min_scalar_type(n))
+    cycle = largest_start[n].copy()
+    current = cycle.copy()
+    for position in range(n):
+        perms[:, position] = current
+        following = successor[current, rows]
+        closed = following == cycle
+        cycle = np.where(closed, largest_start[cycle - 1, rows], cycle)
+        current = np.where(closed, cycle, following)
+    return perms
+
+
+def rank_permutation(perm: Sequence[int]) -> int:
+    """
+    Find the lexicographic rank of a permutation of the integers from 1 to n.
+
+    Ranks follow the order of itertools.permutations(range(1, n + 1)), starting at 0.
+
+    Args:
+        perm (Sequence[int]): A permutation of the integers from 1 to n.
+
+    Returns:
+        int: The rank of the permutation, computed from its Lehmer code.
+    """
+    n = len(perm)
+    if sorted(perm) != list(range(1, n + 1)):
+        raise ValueError("Sequence must be a permutation of 1..n.")
+    remaining = list(range(1, n + 1))
+    rank = 0
+    for i, value in enumerate(perm):
+        index = remaining.index(value)
+        rank += index * factorial(n - 1 - i)
+        remaining.pop(index)
+    return rank
+
+
+def unrank_permutation(rank: int, n: int) -> Tuple[int, ...]:
+    """
+    Find the permutation of the integers from 1 to n with a given lexicographic rank.
+
+    Args:
+        rank (int): A rank from 0 to n! - 1.
+        n (int): The length of the permutation.
+
+    Returns:
+        Tuple[int, ...]: The permutation, built from the Lehmer code of rank.
+    """
+    if not 0 <= rank < factorial(n):
+        raise ValueError("Rank must be in the range 0 to n! - 1.")
+    remaining = list(range(1, n + 1))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        index, rank = divmod(rank, factorial(i))
+        perm.append(remaining.pop(index))
+    return tuple(perm)
+
+
+def _next_permutation(perm: List[int]) -> None:
+    """Rearrange a list, in place, into the next permutation in lexicographic order."""
+    i = len(perm) - 2
+    while i >= 0 and perm[i] > perm[i + 1]:
+        i -= 1
+    if i < 0:
+        return
+    j = len(perm) - 1
+    while perm[j] < perm[i]:
+        j -= 1
+    perm[i], perm[j] = perm[j], perm[i]
+    perm[i + 1 :] = perm[:i:-1]
+
+
+def generate_permutations(
+    n: int, start: int = 0, stop: Optional[int] = None
+) -> Generator[Tuple[int, ...], None, None]:
+    """
+    Generate the permutations of the integers from 1 to n with ranks from start up to stop.
+
+    Args:
+        n (int): The length of the permutations.
+        start (int): The rank of the first permutation.
+        stop (Optional[int]): The rank after the last permutation. Defaults to n!.
+
+    Yields:
+        Generator[Tuple[int, ...], None, None]: The permutations, in lexicographic order.
+    """
+    total = factorial(n)
+    stop = total if stop is None else stop
+    if not 0 <= start <= stop <= total:
+        raise ValueError("Ranks must satisfy 0 <= start <= stop <= n!.")
+    if start == stop:
+        return
+    perm = list(unrank_permutation(start, n))
+    for _ in range(stop - start):
+        yield tuple(perm)
+        _next_permutation(perm)
+
+
+# Permutations of the last SUFFIX_LENGTH positions are copied from a precomputed table.
+SUFFIX_LENGTH = 8
+
+
+@lru_cache(maxsize=None)
+def _suffix_table(k: int) -> np.ndarray:
+    """Returns every permutation of 0..k-1, in lexicographic order, as a (k!, k) array."""
+    table = np.array(list(permutations(range(k))), dtype=np.uint8)
+    return table.reshape(factorial(k), k)
+
+
+def permutation_blocks(
+    n: int, start: int = 0, stop: Optional[int] = None, block_size: int = 1 << 16
+) -> Generator[np.ndarray, None, None]:
+    """
+    Generate the permutations of the integers from 1 to n, with ranks from start up to stop,
+    as (block_size, n) arrays of the smallest unsigned type that holds n.
+
+    Ranks split into a prefix rank and a suffix rank. Each run of consecutive ranks that
+    shares a prefix is filled with two array assignments: the prefix, decoded once from
+    its Lehmer code, and the remaining values permuted by rows of a table of every
+    permutation of the last SUFFIX_LENGTH positions. No Python object is made per permutation.
+
+    Args:
+        n (int): The length of the permutations.
+        start (int): The rank of the first permutation.
+        stop (Optional[int]): The rank after the last permutation. Defaults to n!.
+        block_size (int): The most permutations per block. The last block may be shorter.
+
+    Yields:
+        Generator[np.ndarray, None, None]: The permutations, in lexicographic order. Every
+            block is a view of the same buffer, overwritten by the next one; copy it to keep it.
+    """
+    total = factorial(n)
+    stop = total if stop is None else stop
+    if not 0 <= start <= stop <= total:
+        raise ValueError("Ranks must satisfy 0 <= start <= stop <= n!.")
+    if start == stop:
+        return
+    dtype = np.min_scalar_type(n)
+    k = min(n, SUFFIX_LENGTH)
+    suffixes = _suffix_table(k)
+    width = len(suffixes)
+    buffer = np.empty((min(block_size, stop - start), n), dtype=dtype)
+    prefix_rank, head, rest = None, None, None
+    for first in range(start, stop, block_size):
+        block = buffer[: min(block_size, stop - first)]
+        filled = 0
+        while filled < len(block):
+            rank, offset = divmod(first + filled, width)
+            if rank != prefix_rank:
+                # The first permutation with this prefix has the rest in increasing order.
+                perm = np.array(unrank_permutation(rank * width, n), dtype=dtype)
+                prefix_rank, head, rest = rank, perm[: n - k], perm[n - k :]
+            rows = min(width - offset, len(block) - filled)
+            block[filled : filled + rows, : n - k] = head
+            block[filled : filled + rows, n - k :] = rest[
+                suffixes[offset : offset + rows]
+            ]
+            filled += rows
+        yield block
+
+
+def rank_ranges(n: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split the ranks of the permutations of n integers into contiguous, nearly equal ranges.
+
+    Args:
+        n (int): The length of the permutations.
+        parts (int): The number of ranges.
+
+    Returns:
+        List[Tuple[int, int]]: (start, stop) pairs that together cover 0 to n! exactly once.
+    """
+    total = factorial(n)
+    bounds = [total * i // parts for i in range(parts + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
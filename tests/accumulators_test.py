@@ -0,0 +1,79 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from streaks2.accumulators import StreakAccumulators, streak_length_counts
+from streaks2.streaks import KvStreaks
+
+
+def test_add() -> None:
+    acc = StreakAccumulators(3)
+    acc.add({2: 1, 1: 2})  # (2)(1 3)
+    acc.add({1: 3})  # (1 2 3)
+    assert acc.permutations == 2
+    np.testing.assert_array_equal(acc.lengths, [0, 1, 1, 1])
+    np.testing.assert_array_equal(acc.counts, [0, 1, 1, 0])
+    assert acc.sl[2, 1] == 1
+    assert acc.sl[1, 2] == 1
+    assert acc.sl[1, 3] == 1
+    np.testing.assert_array_equal(acc.present, [0, 1, 1, 1])
+
+
+def test_summaries() -> None:
+    acc = StreakAccumulators(3)
+    acc.add({2: 1, 1: 2})
+    acc.add({1: 3})
+    np.testing.assert_array_equal(acc.length_summary(), [3, 1, 1, 1])
+    np.testing.assert_array_equal(acc.count_summary(), [2, 1, 1, 0])
+    np.testing.assert_array_equal(acc.absent_summary(), [3, 1, 1, 1])
+    sl = acc.sl_summary()
+    assert sl[0, 0] == 3
+    np.testing.assert_array_equal(sl[0, 1:], [1, 1, 1])
+    np.testing.assert_array_equal(sl[1:, 0], [2, 1, 0])
+
+
+def test_object_dtype() -> None:
+    acc = StreakAccumulators(2, dtype=object)
+    acc.add({1: 2})
+    assert acc.length_summary().dtype == object
+    assert acc.absent_summary()[1] == 1
+
+
+def test_merge() -> None:
+    acc = StreakAccumulators(3)
+    acc.add({2: 1, 1: 2})
+    other = StreakAccumulators(3)
+    other.add({1: 3})
+    acc.merge(other)
+    assert acc.permutations == 2
+    np.testing.assert_array_equal(acc.lengths, [0, 1, 1, 1])
+    np.testing.assert_array_equal(acc.present, [0, 1, 1, 1])
+
+
+def test_merge_value_error() -> None:
+    with pytest.raises(ValueError, match=r"^Accumulators must be for the same n.$"):
+        StreakAccumulators(3).merge(StreakAccumulators(4))
+
+
+def test_add_batch_matches_add() -> None:
+    n = 5
+    perms = np.array(list(permutations(range(1, n + 1))), dtype=np.uint8)
+    batched = StreakAccumulators(n)
+    batched.add_batch(perms[:50])
+    batched.add_batch(perms[50:])
+    one_by_one = StreakAccumulators(n)
+    for perm in perms.tolist():
+        one_by_one.add(KvStreaks(perm).kv_streaks)
+    assert batched.permutations == one_by_one.permutations
+    for name in StreakAccumulators.FIELDS:
+        assert np.array_equal(getattr(batched, name), getattr(one_by_one, name))
+
+
+def test_streak_length_counts() -> None:
+    lengths = np.array([1, 3, 2, 2, 1, 1, 1, 1])
+    counts = np.array([2, 2, 4])
+    expected = np.array([[0, 1, 0, 1, 0], [0, 0, 2, 0, 0], [0, 4, 0, 0, 0]])
+    result = streak_length_counts(lengths, counts, 5, np.uint8)
+    np.testing.assert_array_equal(result, expected)
+    assert result.dtype == np.uint8
@@ -0,0 +1,44 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from streaks2.batch import find_streaks_batch, streak_start_mask
+from streaks2.streaks import KvStreaks
+
+
+def test_streak_start_mask() -> None:
+    perms = np.array([[3, 1, 2], [1, 2, 3]])
+    expected = np.array([[True, True, False], [True, False, False]])
+    np.testing.assert_array_equal(streak_start_mask(perms), expected)
+
+
+def test_streak_start_mask_value_error() -> None:
+    with pytest.raises(ValueError, match=r"^Input array must be 2-dimensional.$"):
+        streak_start_mask(np.array([1, 2, 3]))
+
+
+def test_find_streaks_batch() -> None:
+    perms = np.array([[4, 1, 2, 3], [2, 4, 1, 3], [4, 3, 2, 1]])
+    starts, lengths, counts = find_streaks_batch(perms)
+    np.testing.assert_array_equal(starts, [4, 1, 2, 1, 4, 3, 2, 1])
+    np.testing.assert_array_equal(lengths, [1, 3, 2, 2, 1, 1, 1, 1])
+    np.testing.assert_array_equal(counts, [2, 2, 4])
+
+
+def test_find_streaks_batch_matches_kv_streaks() -> None:
+    n = 6
+    perms = np.array(list(permutations(range(1, n + 1))))
+    starts, lengths, counts = find_streaks_batch(perms)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    for row, perm in enumerate(perms):
+        lo, hi = offsets[row], offsets[row + 1]
+        batch = dict(zip(starts[lo:hi].tolist(), lengths[lo:hi].tolist()))
+        assert batch == KvStreaks(list(perm)).kv_streaks
+
+
+def test_find_streaks_batch_empty() -> None:
+    starts, lengths, counts = find_streaks_batch(np.zeros((2, 0), dtype=int))
+    assert starts.size == 0
+    assert lengths.size == 0
+    np.testing.assert_array_equal(counts, [0, 0])
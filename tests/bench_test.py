@@ -0,0 +1,41 @@
+import json
+
+from streaks2 import bench
+
+
+def test_run_benchmarks_records_results() -> None:
+    results = bench.run_benchmarks(quick=True, select="StreakStatistics[n=6]")
+    assert results["environment"]["numpy"]
+    [result] = results["results"]
+    assert result["name"] == "StreakStatistics[n=6]"
+    assert result["items"] == 720
+    assert result["seconds"] > 0 and result["peak_bytes"] > 0
+    json.dumps(results)
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {"results": [{"name": "a", "seconds": 1.0, "peak_bytes": 100}]}
+    assert bench.compare(baseline, baseline) == []
+    slower = {"results": [{"name": "a", "seconds": 1.5, "peak_bytes": 100}]}
+    [regression] = bench.compare(baseline, slower)
+    assert regression.startswith("a: seconds")
+    assert bench.compare(baseline, slower, threshold=0.6) == []
+    other = {"results": [{"name": "b", "seconds": 9.0, "peak_bytes": 900}]}
+    assert bench.compare(baseline, other) == []
+
+
+def test_main_compare_exit_status(tmp_path) -> None:
+    baseline = {"results": [{"name": "a", "seconds": 1.0, "peak_bytes": 100}]}
+    bigger = {"results": [{"name": "a", "seconds": 1.0, "peak_bytes": 200}]}
+    (tmp_path / "base.json").write_text(json.dumps(baseline))
+    (tmp_path / "new.json").write_text(json.dumps(bigger))
+    assert (
+        bench.main(
+            ["compare", str(tmp_path / "base.json"), str(tmp_path / "base.json")]
+        )
+        == 0
+    )
+    assert (
+        bench.main(["compare", str(tmp_path / "base.json"), str(tmp_path / "new.json")])
+        == 1
+    )
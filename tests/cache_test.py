@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+from streaks2 import exact
+from streaks2.cache import ResultCache
+from streaks2.streaks import StreakStatistics
+
+
+def _assert_same(a: StreakStatistics, b: StreakStatistics) -> None:
+    for name, table in a.tables().items():
+        assert np.array_equal(table, b.tables()[name]), name
+
+
+def test_cache_round_trip(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    assert cache.get(5, "enumerate") is None
+    computed = StreakStatistics(5, cache=cache)
+    assert len(os.listdir(tmp_path)) == 1
+    loaded = StreakStatistics(5, cache=cache)
+    assert isinstance(loaded.counts, np.memmap)
+    _assert_same(computed, loaded)
+
+
+def test_cache_arbitrary_precision(tmp_path) -> None:
+    computed = StreakStatistics(30, engine="exact", cache=str(tmp_path))
+    loaded = StreakStatistics(30, engine="exact", cache=str(tmp_path))
+    assert loaded.counts.dtype == object
+    assert loaded.counts[0] == computed.counts[0]
+    _assert_same(computed, loaded)
+
+
+def test_cache_keys_by_engine(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    StreakStatistics(4, cache=cache)
+    assert cache.get(4, "exact") is None
+    assert cache.key(4, "exact") != cache.key(4, "enumerate")
+    assert cache.key(4, "exact") != cache.key(5, "exact")
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    for n in (3, 4, 5):
+        StreakStatistics(n, cache=cache)
+        os.utime(cache._path(cache.key(n, "enumerate")), (n, n))
+    cache.get(3, "enumerate")  # 3 is now the most recently used
+    newest = cache._path(cache.key(3, "enumerate"))
+    cache.max_bytes = sum(entry.stat().st_size for entry in os.scandir(newest))
+    cache.evict()
+    assert cache.get(3, "enumerate") is not None
+    assert cache.get(4, "enumerate") is None
+    assert cache.get(5, "enumerate") is None
+
+
+def test_cache_concurrent_writer_wins(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    tables = StreakStatistics(3).tables()
+    cache.put(3, "enumerate", tables)
+    cache.put(3, "enumerate", tables)  # the entry exists; the second write is dropped
+    assert [n for n in os.listdir(tmp_path) if not n.startswith(".")] == [
+        cache.key(3, "enumerate")
+    ]
+    assert not [n for n in os.listdir(tmp_path) if n.startswith(".")]
+
+
+def test_cache_clear(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    StreakStatistics(3, cache=cache)
+    cache.clear()
+    assert cache.get(3, "enumerate") is None
+
+
+def test_cache_exact_lazy_tables(tmp_path, monkeypatch) -> None:
+    """Test that expensive exact tables are stored when first used, not eagerly."""
+    cache = ResultCache(str(tmp_path))
+    computed = StreakStatistics(8, engine="exact", cache=cache)
+    assert set(cache.get(8, "exact")) == {"length_counts", "counts", "absent_counts"}
+    expected = computed.count_longest_counts
+    assert "count_longest_counts" in cache.get(8, "exact")
+
+    def fail(n):
+        raise AssertionError("recomputed a cached table")
+
+    monkeypatch.setattr(exact, "count_longest_counts", fail)
+    loaded = StreakStatistics(8, engine="exact", cache=cache)
+    assert np.array_equal(loaded.count_longest_counts, expected)
+    assert np.array_equal(loaded.sl_streak_counts, computed.sl_streak_counts)
+    assert "sl_streak_counts" in cache.get(8, "exact")
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from streaks2.checkpoint import (
+    accumulate_with_checkpoints,
+    load_checkpoint,
+    save_checkpoint,
+)
+from streaks2.streaks import StreakStatistics
+
+
+def test_save_load_checkpoint(tmp_path) -> None:
+    path = tmp_path / "run.npz"
+    accumulators = StreakStatistics._accumulate_ranks(4, 0, 10)
+    save_checkpoint(str(path), accumulators, 10)
+    loaded, stop = load_checkpoint(str(path))
+    assert stop == 10
+    assert loaded.n == 4
+    assert loaded.permutations == 10
+    for name in loaded.FIELDS:
+        assert np.array_equal(getattr(loaded, name), getattr(accumulators, name))
+
+
+def test_resume_from_checkpoint(tmp_path) -> None:
+    """Test that a run interrupted part-way resumes to the same result."""
+    n = 5
+    path = str(tmp_path / "run.npz")
+    save_checkpoint(path, StreakStatistics._accumulate_ranks(n, 0, 37), 37)
+    resumed = StreakStatistics(n, checkpoint=path, checkpoint_every=25)
+    expected = StreakStatistics(n)
+    assert np.array_equal(resumed.length_counts, expected.length_counts)
+    assert np.array_equal(resumed.counts, expected.counts)
+    assert np.array_equal(resumed.absent_counts, expected.absent_counts)
+    assert np.array_equal(resumed.sl_streak_counts, expected.sl_streak_counts)
+    assert load_checkpoint(path)[1] == 120
+
+
+def test_checkpoint_wrong_n(tmp_path) -> None:
+    path = str(tmp_path / "run.npz")
+    save_checkpoint(path, StreakStatistics._accumulate_ranks(3, 0, 2), 2)
+    with pytest.raises(ValueError, match=r"^Checkpoint is for n=3, not n=4.$"):
+        StreakStatistics(4, checkpoint=path)
+
+
+def test_checkpoint_every_must_advance(tmp_path) -> None:
+    path = str(tmp_path / "run.npz")
+    match = r"^Checkpoints must be at least one permutation apart.$"
+    with pytest.raises(ValueError, match=match):
+        StreakStatistics(4, checkpoint=path, checkpoint_every=0)
+    with pytest.raises(ValueError, match=match):
+        accumulate_with_checkpoints(4, path, -1)
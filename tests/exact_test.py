@@ -0,0 +1,110 @@
+from itertools import combinations, permutations
+from math import factorial
+
+import numpy as np
+import pytest
+from sympy.functions.combinatorial.numbers import stirling
+
+from streaks2 import exact
+from streaks2.streaks import KvStreaks, StreakStatistics
+
+
+def test_stirling_first() -> None:
+    for n in range(0, 12):
+        expected = [stirling(n, k, kind=1) for k in range(n + 1)]
+        assert list(exact.stirling_first(n)) == expected
+
+
+def test_factorials() -> None:
+    assert exact.factorials(5) == [1, 1, 2, 6, 24, 120]
+
+
+def test_engines_agree() -> None:
+    """Test that the exact engine matches the enumeration engine for small n."""
+    for n in range(1, 8):
+        enumerated = StreakStatistics(n)
+        computed = StreakStatistics(n, engine="exact")
+        assert np.array_equal(enumerated.length_counts, computed.length_counts)
+        assert np.array_equal(enumerated.counts, computed.counts)
+        assert np.array_equal(enumerated.absent_counts, computed.absent_counts)
+        assert np.array_equal(enumerated.sl_streak_counts, computed.sl_streak_counts)
+        assert np.array_equal(
+            enumerated.count_longest_counts, computed.count_longest_counts
+        )
+
+
+def test_exact_large_n() -> None:
+    n = 500
+    stats = StreakStatistics(n, engine="exact")
+    assert sum(stats.by_count()) == factorial(n)
+    assert stats.of_length(7) == factorial(n) // 7
+    assert stats.length_counts[0] == sum(factorial(n) // k for k in range(1, n + 1))
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(ValueError, match=r"^Unknown engine: magic$"):
+        StreakStatistics(3, engine="magic")
+
+
+def test_sweep_matches_engines() -> None:
+    swept = list(StreakStatistics.sweep(7))
+    assert [stats.n for stats in swept] == list(range(1, 8))
+    for stats in swept:
+        assert stats.engine == "exact"
+        enumerated = StreakStatistics(stats.n)
+        for name, table in enumerated.tables().items():
+            assert np.array_equal(stats.tables()[name], table), (stats.n, name)
+
+
+def test_sweep_large_n() -> None:
+    last = 60
+    for stats in StreakStatistics.sweep(last):
+        pass
+    expected = StreakStatistics(last, engine="exact")
+    for name, table in expected.tables().items():
+        assert np.array_equal(stats.tables()[name], table), name
+
+
+def test_lacking_lengths_count_matches_enumeration() -> None:
+    for n in range(7):
+        present = [
+            set(KvStreaks(list(perm)).kv_streaks.values())
+            for perm in permutations(range(1, n + 1))
+        ]
+        for size in range(3):
+            for lengths in combinations(range(1, n + 2), size):
+                expected = sum(1 for seen in present if not seen & set(lengths))
+                assert exact.lacking_lengths_count(n, lengths) == expected
+
+
+def test_lacking_lengths_count_singletons_match_absent_counts() -> None:
+    n = 30
+    absent = exact.lacking_length_counts(n)
+    for length in range(1, n + 1):
+        assert exact.lacking_lengths_count(n, [length]) == absent[length]
+    assert exact.lacking_lengths_count(n, []) == factorial(n)
+    assert exact.lacking_lengths_count(n, range(1, n + 1)) == 0
+
+
+def test_lacking_lengths_count_rejects_nonpositive() -> None:
+    with pytest.raises(ValueError):
+        exact.lacking_lengths_count(5, [0, 2])
+
+
+def test_count_longest_counts_matches_kv_streaks() -> None:
+    for n in range(8):
+        expected = np.zeros((n + 1, n + 1), dtype=object)
+        for perm in permutations(range(1, n + 1)):
+            lengths = KvStreaks(list(perm)).kv_streaks.values()
+            expected[len(lengths), max(lengths, default=0)] += 1
+        assert np.array_equal(exact.count_longest_counts(n), expected)
+
+
+def test_count_longest_large_n() -> None:
+    n = 120
+    stats = StreakStatistics(n, engine="exact")
+    table = stats.count_longest_counts
+    assert np.array_equal(table[1:, 0], stats.by_count())
+    assert sum(stats.by_longest()) == factorial(n)
+    assert stats.by_longest()[n - 1] == factorial(n - 1)  # one n-cycle
+    assert stats.by_longest()[0] == 1  # only n, n-1, ..., 1
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+# Override with STREAKS2_IMPORT_BUDGET_MS on slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("STREAKS2_IMPORT_BUDGET_MS", 150))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import streaks2.streaks
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [m for m in ("sympy", "scipy", "termcolor") if m in sys.modules]
+print(json.dumps({"ms": elapsed, "heavy": heavy}))
+"""
+
+
+def _import_in_fresh_process() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_skips_heavy_modules() -> None:
+    assert _import_in_fresh_process()["heavy"] == []
+
+
+def test_import_time_within_budget() -> None:
+    # The best of a few runs, so one slow start on a busy machine doesn't fail the test.
+    best = min(_import_in_fresh_process()["ms"] for _ in range(3))
+    assert best < IMPORT_BUDGET_MS, f"import streaks2.streaks took {best:.0f} ms"
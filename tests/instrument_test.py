@@ -0,0 +1,75 @@
+import math
+from math import factorial
+
+import numpy as np
+import pytest
+
+from streaks2.instrument import PHASES, Instrumentation
+from streaks2.streaks import StreakStatistics
+
+
+def test_instrumented_run_matches_plain_run() -> None:
+    updates = []
+    instrument = Instrumentation(progress=updates.append, interval=0)
+    stats = StreakStatistics(8, instrument=instrument)
+    plain = StreakStatistics(8)
+    assert np.array_equal(stats.length_counts, plain.length_counts)
+    assert np.array_equal(stats.sl_streak_counts, plain.sl_streak_counts)
+    assert updates[-1].done == updates[-1].total == 40320
+    assert [u.done for u in updates] == sorted(u.done for u in updates)
+    assert updates[-1].eta == 0
+    assert all(instrument.phases[name] > 0 for name in PHASES)
+
+
+def test_progress_interval_limits_calls() -> None:
+    updates = []
+    StreakStatistics(
+        8, instrument=Instrumentation(progress=updates.append, interval=3600)
+    )
+    assert len(updates) == 1  # only the final report
+
+
+@pytest.mark.parametrize("engine", ["exact", "plain-changes"])
+def test_instrumented_closed_engines(engine) -> None:
+    instrument = Instrumentation()
+    StreakStatistics(5, engine=engine, instrument=instrument)
+    assert instrument.done == 120
+    assert instrument.phases["accumulate"] > 0
+
+
+def test_instrumented_exact_beyond_float_range() -> None:
+    updates = []
+    instrument = Instrumentation(progress=updates.append)
+    StreakStatistics(200, engine="exact", instrument=instrument)
+    assert updates[-1].done == updates[-1].total == factorial(200)
+    assert updates[-1].rate == math.inf
+    assert updates[-1].eta == 0
+    assert (
+        f"{factorial(200)} of {factorial(200)} permutations, inf/s"
+        in instrument.report()
+    )
+
+
+def test_instrumented_checkpoint_run(tmp_path) -> None:
+    instrument = Instrumentation()
+    StreakStatistics(
+        6,
+        checkpoint=str(tmp_path / "c.npz"),
+        checkpoint_every=100,
+        instrument=instrument,
+    )
+    assert instrument.done == 720
+
+
+@pytest.mark.parametrize("profile", ["cprofile", "tracemalloc"])
+def test_profile_report(profile) -> None:
+    instrument = Instrumentation(profile=profile, sample_every=2)
+    StreakStatistics(9, instrument=instrument)
+    report = instrument.report()
+    assert "generate" in report
+    assert "find_streaks_batch" in report or "batch.py" in report
+
+
+def test_unknown_profiler() -> None:
+    with pytest.raises(ValueError):
+        Instrumentation(profile="perf")
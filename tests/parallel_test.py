@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from streaks2.parallel import parallel_accumulate, prefixes
+from streaks2.streaks import StreakStatistics
+
+
+def test_prefixes() -> None:
+    assert prefixes(4, 1) == [(1,), (2,), (3,), (4,)]
+    assert len(prefixes(4, 2)) == 12
+    assert prefixes(2, 64) == [(1, 2), (2, 1)]
+    assert prefixes(0, 4) == [()]
+
+
+def test_parallel_accumulate_matches_serial() -> None:
+    n = 6
+    serial = StreakStatistics._accumulate(n)
+    parallel = parallel_accumulate(n, 2)
+    assert parallel.permutations == serial.permutations
+    for name in ("lengths", "counts", "sl", "present"):
+        assert np.array_equal(getattr(parallel, name), getattr(serial, name))
+
+
+def test_str_stats_jobs() -> None:
+    n = 5
+    serial = StreakStatistics(n)
+    parallel = StreakStatistics(n, jobs=3)
+    assert np.array_equal(parallel.length_counts, serial.length_counts)
+    assert np.array_equal(parallel.counts, serial.counts)
+    assert np.array_equal(parallel.absent_counts, serial.absent_counts)
+    assert np.array_equal(parallel.sl_streak_counts, serial.sl_streak_counts)
+
+
+def test_unsupported_combinations() -> None:
+    with pytest.raises(ValueError, match="only supported by the enumerate engine"):
+        StreakStatistics(4, engine="exact", jobs=2)
+    with pytest.raises(ValueError, match="only supported by the enumerate engine"):
+        StreakStatistics(4, engine="plain-changes", checkpoint="unused.npz")
+    with pytest.raises(ValueError, match="cannot be combined"):
+        StreakStatistics(4, jobs=2, checkpoint="unused.npz")
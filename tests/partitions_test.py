@@ -0,0 +1,79 @@
+from collections import Counter
+from itertools import permutations
+from math import factorial
+
+import numpy as np
+import pytest
+
+from streaks2.partitions import (
+    PartitionIndex,
+    build_partition_index,
+    iter_partition_counts,
+    partition_count,
+    partition_histogram,
+)
+from streaks2.streaks import KvStreaks, StreakStatistics
+from streaks2.utils import unrank_permutation
+
+
+def _streak_type(perm) -> tuple:
+    return tuple(sorted(KvStreaks(list(perm)).kv_streaks.values(), reverse=True))
+
+
+def test_partition_histogram_matches_enumeration() -> None:
+    for n in range(8):
+        expected = Counter(_streak_type(perm) for perm in permutations(range(1, n + 1)))
+        assert partition_histogram(n) == expected
+
+
+def test_partition_histogram_totals() -> None:
+    n = 25
+    histogram = partition_histogram(n)
+    assert len(histogram) == 1958
+    assert sum(histogram.values()) == factorial(n)
+    for partition, count in histogram.items():
+        assert list(partition) == sorted(partition, reverse=True)
+        assert partition_count(n, partition[::-1]) == count
+
+
+def test_partition_count_not_a_partition() -> None:
+    assert partition_count(5, (3, 1)) == 0
+    assert partition_count(2, (3, -1)) == 0
+
+
+def test_iter_partition_counts_order() -> None:
+    assert list(iter_partition_counts(4)) == [
+        ((4,), 6),
+        ((3, 1), 8),
+        ((2, 1, 1), 6),
+        ((2, 2), 3),
+        ((1, 1, 1, 1), 1),
+    ]
+
+
+def test_by_type_matches_marginals() -> None:
+    n = 7
+    stats = StreakStatistics(n)
+    lengths = np.zeros(n + 1, dtype=object)
+    for partition, count in stats.by_type().items():
+        for k in partition:
+            lengths[k] += count
+    assert np.array_equal(lengths[1:], stats.by_length())
+
+
+def test_partition_index_lookup(tmp_path) -> None:
+    n = 7
+    build_partition_index(n, tmp_path / "index.npz")
+    index = PartitionIndex.load(tmp_path / "index.npz")
+    assert index.counts() == partition_histogram(n)
+    ranks = index.lookup((1, 2, 2, 2))
+    assert len(ranks) == partition_count(n, (2, 2, 2, 1))
+    assert np.all(np.diff(ranks.astype(np.int64)) > 0)
+    for rank in ranks:
+        assert _streak_type(unrank_permutation(int(rank), n)) == (2, 2, 2, 1)
+    assert index.lookup((4, 4)).size == 0
+
+
+def test_partition_index_limit() -> None:
+    with pytest.raises(ValueError):
+        build_partition_index(11)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from streaks2.plain_changes import accumulate_plain_changes
+from streaks2.streaks import StreakStatistics
+
+
+def test_accumulate_plain_changes_matches_enumeration() -> None:
+    for n in range(0, 8):
+        incremental = accumulate_plain_changes(n)
+        enumerated = StreakStatistics._accumulate(n)
+        assert incremental.permutations == enumerated.permutations
+        for name in enumerated.FIELDS:
+            assert np.array_equal(
+                getattr(incremental, name), getattr(enumerated, name)
+            ), f"{name} differs for n={n}"
+
+
+def test_str_stats_plain_changes_engine() -> None:
+    n = 5
+    stats = StreakStatistics(n, engine="plain-changes")
+    expected = StreakStatistics(n)
+    assert stats.engine == "plain-changes"
+    assert np.array_equal(stats.by_length(), expected.by_length())
+    assert np.array_equal(stats.by_count(), expected.by_count())
+    assert np.array_equal(
+        stats.missing_streak_lengths(), expected.missing_streak_lengths()
+    )
+    assert np.array_equal(stats.sl_streak_counts, expected.sl_streak_counts)
@@ -0,0 +1,103 @@
+import io
+
+import numpy as np
+import pytest
+
+from streaks2.render import export_table, write_table
+from streaks2.streaks import StreakStatistics
+
+
+def _old_str(arr: np.ndarray) -> str:
+    """The plain text the cell-by-cell __str__ produced."""
+    return "".join(" ".join(str(x) for x in row) + " \n" for row in arr.tolist())
+
+
+def test_write_table_plain_matches_cells() -> None:
+    arr = StreakStatistics(4).streaks_arr
+    buffer = io.StringIO()
+    write_table(arr, buffer, color=False)
+    assert buffer.getvalue() == _old_str(arr)
+
+
+def test_write_table_color_marks_summaries() -> None:
+    arr = np.arange(6).reshape(2, 3)
+    buffer = io.StringIO()
+    write_table(arr, buffer, color=True)
+    first, second = buffer.getvalue().splitlines()
+    assert first.count("\x1b[31m") == 1 and first.count("\x1b[32m") == 2
+    assert second.count("\x1b[32m") == 1 and second.endswith("4 5 ")
+
+
+def test_write_table_head_tail() -> None:
+    arr = np.arange(20).reshape(10, 2)
+    buffer = io.StringIO()
+    write_table(arr, buffer, head=2, tail=1, color=False)
+    assert buffer.getvalue() == "0 1 \n2 3 \n...\n18 19 \n"
+    buffer = io.StringIO()
+    write_table(arr, buffer, head=8, tail=5, color=False)
+    assert buffer.getvalue() == _old_str(arr)
+
+
+def test_write_table_not_2d() -> None:
+    with pytest.raises(ValueError):
+        write_table(np.zeros(3), io.StringIO())
+
+
+def test_str_stats_write_summary_only() -> None:
+    for engine in ("enumerate", "exact"):
+        buffer = io.StringIO()
+        StreakStatistics(5, engine=engine).write(buffer, summary_only=True, color=False)
+        assert buffer.getvalue() == _old_str(StreakStatistics(5).streaks_arr[:1])
+
+
+def test_export_table(tmp_path) -> None:
+    stats = StreakStatistics(4)
+    stats.export(tmp_path / "t.csv")
+    stats.export(tmp_path / "t.tsv", fmt="tsv")
+    stats.export(tmp_path / "t.npy", fmt="npy")
+    assert np.array_equal(
+        np.loadtxt(tmp_path / "t.csv", delimiter=","), stats.streaks_arr
+    )
+    assert np.array_equal(
+        np.loadtxt(tmp_path / "t.tsv", delimiter="\t"), stats.streaks_arr
+    )
+    assert np.array_equal(np.load(tmp_path / "t.npy"), stats.streaks_arr)
+    with pytest.raises(ValueError):
+        export_table(stats.streaks_arr, tmp_path / "t.xml", fmt="xml")
+
+
+def test_export_summary_only(tmp_path) -> None:
+    stats = StreakStatistics(25, engine="exact")
+    stats.export(tmp_path / "t.csv")
+    with open(tmp_path / "t.csv") as f:
+        row = [int(cell) for cell in f.read().split(",")]
+    assert row == list(stats.length_counts)
+    assert row[0] == sum(row[1:]) > 2**64  # beyond int64, exactly
+    enumerated = StreakStatistics(4)
+    enumerated.export(tmp_path / "s.csv", summary_only=True)
+    assert np.array_equal(
+        np.loadtxt(tmp_path / "s.csv", delimiter=",", ndmin=2),
+        enumerated.streaks_arr[:1],
+    )
+
+
+def test_str_stats_write_head_tail_matches_table() -> None:
+    stats = StreakStatistics(4)
+    for head, tail in ((None, None), (3, None), (None, 2), (3, 2), (0, 30), (20, 10)):
+        written, expected = io.StringIO(), io.StringIO()
+        stats.write(written, head=head, tail=tail, color=False)
+        write_table(stats.streaks_arr, expected, head=head, tail=tail, color=False)
+        assert written.getvalue() == expected.getvalue(), (head, tail)
+
+
+def test_str_stats_write_head_tail_large_n() -> None:
+    """Test that head and tail rows are generated without building the rest."""
+    stats = StreakStatistics(25, engine="exact")
+    assert str(stats).count("\n") == 1  # the summary row alone
+    buffer = io.StringIO()
+    stats.write(buffer, head=3, tail=2, summary_only=False, color=False)
+    lines = buffer.getvalue().splitlines()
+    assert len(lines) == 6 and lines[3] == "..."
+    assert lines[1] == "1 0 " + "0 " * 23 + "1 "  # 1, 2, ..., 25: one streak
+    assert lines[-1] == "25 " + "25 " + "0 " * 24  # 25, 24, ..., 1: 25 singletons
+    assert "streak_rows" not in vars(stats)
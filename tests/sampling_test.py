@@ -0,0 +1,79 @@
+from math import factorial
+
+import numpy as np
+import pytest
+
+from streaks2.sampling import SampledStreakTables
+from streaks2.streaks import StreakStatistics
+
+
+def test_sample_close_to_exact() -> None:
+    n = 6
+    exact = StreakStatistics(n, engine="exact")
+    sampled = StreakStatistics.sample(n, samples=200_000, seed=1)
+    assert sampled.engine == "sample"
+    assert sampled.samples == 200_000
+    for estimate, stderr, expected in [
+        (sampled.length_counts, sampled.length_stderr, exact.length_counts),
+        (sampled.counts, sampled.count_stderr, exact.counts),
+        (sampled.absent_counts, sampled.absent_stderr, exact.absent_counts),
+    ]:
+        expected = expected.astype(float)
+        assert np.all(np.abs(estimate - expected) <= 5 * stderr + 1e-9)
+    sl_error = np.abs(sampled.sl_streak_counts - exact.sl_streak_counts.astype(float))
+    assert np.all(sl_error[1:, 1:] <= 5 * sampled.sl_stderr()[1:, 1:] + 1e-9)
+    longest_error = sampled.count_longest_counts - exact.count_longest_counts.astype(
+        float
+    )
+    assert np.all(np.abs(longest_error) <= 0.01 * factorial(n))
+
+
+def test_sample_reproducible() -> None:
+    first = StreakStatistics.sample(8, samples=1000, seed=7)
+    second = StreakStatistics.sample(8, samples=1000, seed=7)
+    assert np.array_equal(first.counts, second.counts)
+    assert np.array_equal(first.sl_streak_counts, second.sl_streak_counts)
+
+
+def test_sample_count_sum() -> None:
+    stats = StreakStatistics.sample(5, samples=1000, seed=0)
+    assert stats.counts[0] == factorial(5)
+    assert np.isclose(np.sum(stats.by_count()), factorial(5))
+
+
+def test_sample_rtol_stops_early() -> None:
+    tables = SampledStreakTables(
+        5, samples=10_000_000, seed=0, batch_size=10_000, rtol=0.02
+    )
+    assert tables.samples < 10_000_000
+    assert np.max(tables._relative_error()) <= 0.02
+
+
+def test_sample_beyond_float_range() -> None:
+    n = 200
+    stats = StreakStatistics.sample(n, samples=2000, seed=0)
+    assert stats.counts[0] == factorial(n)
+    assert stats.by_length().dtype == object
+
+
+def test_sample_too_few_beyond_float_range() -> None:
+    """Test that the infinite standard errors of fewer than two samples survive scaling."""
+    for samples in (0, 1):
+        stats = StreakStatistics.sample(200, samples=samples, seed=0)
+        assert stats.samples == samples
+        assert stats.length_stderr[1] == np.inf
+        assert stats.absent_stderr[1] == np.inf
+        assert stats.sl_stderr()[1, 1] == np.inf
+
+
+def test_sl_stderr_requires_sample() -> None:
+    with pytest.raises(
+        ValueError,
+        match=r"^Standard errors are only available for sampled statistics.$",
+    ):
+        StreakStatistics(3).sl_stderr()
+
+
+def test_sample_repr() -> None:
+    stats = StreakStatistics.sample(4, samples=10, seed=0)
+    assert repr(stats).startswith("StreakStatistics(n=4, engine='sample'")
@@ -0,0 +1,153 @@
+import asyncio
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from streaks2.server import StatsServer
+from streaks2.streaks import StreakStatistics
+
+
+async def _get(port: int, target: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return int(status_line.split()[1]), headers["content-type"], body
+
+
+def _run(test, executor=None):
+    async def main():
+        server = StatsServer(max_entries=2, executor=executor)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            async with listener:
+                return await test(server, port)
+        finally:
+            server.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_computation() -> None:
+    async def test(server, port):
+        responses = await asyncio.gather(*(_get(port, "/stats/8") for _ in range(6)))
+        assert server.computations == 1
+        assert {body for _, _, body in responses} == {responses[0][2]}
+        status, content_type, body = responses[0]
+        assert status == 200 and content_type == "application/json"
+        tables = json.loads(body)
+        expected = StreakStatistics(8)
+        assert tables["counts"] == expected.counts.tolist()
+        assert tables["count_longest_counts"] == expected.count_longest_counts.tolist()
+        await _get(port, "/stats/8")
+        assert server.computations == 1  # cached
+
+    _run(test, ThreadPoolExecutor(2))
+
+
+def test_requests_for_different_tables_share_one_computation() -> None:
+    async def test(server, port):
+        targets = [f"/stats/6/{name}" for name in StreakStatistics.TABLES[:4]]
+        responses = await asyncio.gather(*(_get(port, target) for target in targets))
+        assert [status for status, _, _ in responses] == [200] * 4
+        assert server.computations == 1
+        expected = StreakStatistics(6)
+        for (_, _, body), name in zip(responses, StreakStatistics.TABLES):
+            assert json.loads(body) == getattr(expected, name).tolist()
+
+    _run(test, ThreadPoolExecutor(2))
+
+
+def test_exact_requests_await_a_covering_computation() -> None:
+    async def test(server, port):
+        full = asyncio.create_task(_get(port, "/stats/40?engine=exact"))
+        while not server.pending:
+            await asyncio.sleep(0.001)
+        status, _, body = await _get(port, "/stats/40/sl_streak_counts?engine=exact")
+        assert status == 200 and server.computations == 1
+        assert json.loads(body) == json.loads((await full)[2])["sl_streak_counts"]
+
+    _run(test, ThreadPoolExecutor(1))
+
+
+def test_malformed_request_line() -> None:
+    async def test(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET\r\n\r\n")
+        await writer.drain()
+        status_line = await reader.readline()
+        writer.close()
+        assert status_line.split()[1] == b"400"
+
+    _run(test, ThreadPoolExecutor(1))
+
+
+def test_lru_eviction() -> None:
+    async def test(server, port):
+        for n in (3, 4, 5, 3):
+            await _get(port, f"/stats/{n}?engine=exact")
+        assert list(server.results) == [(5, "exact"), (3, "exact")]
+        assert server.computations == 4
+
+    _run(test, ThreadPoolExecutor(1))
+
+
+def test_npy_and_json_tables_from_process_pool() -> None:
+    async def test(server, port):
+        status, content_type, body = await _get(
+            port, "/stats/6/sl_streak_counts?format=npy"
+        )
+        assert status == 200 and content_type == "application/octet-stream"
+        table = np.load(io.BytesIO(body))
+        assert np.array_equal(table, StreakStatistics(6).sl_streak_counts)
+        status, _, body = await _get(port, "/stats/30/counts?engine=exact")
+        assert status == 200
+        assert json.loads(body) == StreakStatistics(30, engine="exact").counts.tolist()
+        status, _, _ = await _get(port, "/stats/30/counts?engine=exact&format=npy")
+        assert status == 406
+
+    _run(test)
+
+
+def test_errors() -> None:
+    async def test(server, port):
+        assert (await _get(port, "/health"))[0] == 200
+        assert (await _get(port, "/nowhere"))[0] == 404
+        assert (await _get(port, "/stats/x"))[0] == 400
+        assert (await _get(port, "/stats/40"))[0] == 400
+        assert (await _get(port, "/stats/4?engine=magic"))[0] == 400
+        assert (await _get(port, "/stats/4/nothing"))[0] == 404
+        assert (await _get(port, "/stats/4/counts?format=xml"))[0] == 400
+        assert (await _get(port, "/stats/301?engine=exact"))[0] == 400
+        assert server.computations == 0  # every request was rejected before computing
+
+    _run(test, ThreadPoolExecutor(1))
+
+
+def test_exact_table_requests_compute_only_that_table() -> None:
+    async def test(server, port):
+        status, _, body = await _get(port, "/stats/20/sl_streak_counts?engine=exact")
+        assert status == 200
+        expected = StreakStatistics(20, engine="exact")
+        assert json.loads(body) == expected.sl_streak_counts.tolist()
+        assert "count_longest_counts" not in server.results[(20, "exact")]
+        status, _, body = await _get(port, "/stats/20?engine=exact")
+        assert status == 200 and server.computations == 2
+        assert json.loads(body)["count_longest_counts"] == (
+            expected.count_longest_counts.tolist()
+        )
+        await _get(port, "/stats/20/count_longest_counts?engine=exact")
+        assert server.computations == 2  # cached by the full request
+
+    _run(test, ThreadPoolExecutor(1))
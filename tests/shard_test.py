@@ -0,0 +1,112 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from streaks2 import shard
+from streaks2.streaks import StreakStatistics
+
+
+def _assert_same(stats: StreakStatistics, expected: StreakStatistics) -> None:
+    for name, table in expected.tables().items():
+        assert np.array_equal(stats.tables()[name], table), name
+
+
+def test_shards_in_separate_processes(tmp_path) -> None:
+    n, shards = 7, 3
+    paths = [str(tmp_path / f"shard{i}.npz") for i in range(shards)]
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "streaks2.shard",
+                "run",
+                str(n),
+                str(i),
+                str(shards),
+                path,
+            ]
+        )
+        for i, path in enumerate(paths)
+    ]
+    assert [worker.wait() for worker in workers] == [0] * shards
+    stats = StreakStatistics.from_shards(reversed(paths))
+    assert stats.n == n
+    _assert_same(stats, StreakStatistics(n))
+
+
+def test_merge_cli_and_partial_merges(tmp_path) -> None:
+    n, shards = 6, 4
+    paths = [str(tmp_path / f"shard{i}.npz") for i in range(shards)]
+    for i, path in enumerate(paths):
+        shard.run_shard(n, i, shards, path, every=50)
+    left, right, merged = (
+        str(tmp_path / name) for name in ("left.npz", "right.npz", "all.npz")
+    )
+    assert shard.main(["merge", "--partial", left, *paths[:2]]) == 0
+    assert shard.main(["merge", "--partial", right, *paths[2:]]) == 0
+    assert shard.main(["merge", left, *paths[:2]]) == 1  # incomplete
+    assert shard.main(["merge", merged, left, right]) == 0
+    _assert_same(StreakStatistics.from_shards([merged]), StreakStatistics(n))
+
+
+def test_more_shards_than_permutations(tmp_path) -> None:
+    n, shards = 2, 3
+    paths = [str(tmp_path / f"s{i}.npz") for i in range(shards)]
+    for i, path in enumerate(paths):
+        assert shard.main(["run", str(n), str(i), str(shards), path]) == 0
+    assert [shard.load_shard(path).complete for path in paths] == [True] * shards
+    merged = str(tmp_path / "all.npz")
+    assert shard.main(["merge", merged, *paths]) == 0
+    _assert_same(StreakStatistics.from_shards([merged]), StreakStatistics(n))
+
+
+def test_merge_rejects_gaps_and_overlaps(tmp_path) -> None:
+    n = 5
+    paths = [str(tmp_path / f"shard{i}.npz") for i in range(3)]
+    for i, path in enumerate(paths):
+        shard.run_shard(n, i, 3, path)
+    with pytest.raises(ValueError, match="missing"):
+        shard.merge_shard_files([paths[0], paths[2]], complete=False)
+    with pytest.raises(ValueError, match="overlap"):
+        shard.merge_shard_files([paths[0], paths[0], paths[1], paths[2]])
+    with pytest.raises(ValueError, match="cover"):
+        shard.merge_shard_files(paths[1:])
+    other = str(tmp_path / "other.npz")
+    shard.run_shard(4, 0, 1, other)
+    with pytest.raises(ValueError, match="different n"):
+        shard.merge_shard_files([*paths, other])
+
+
+def test_run_shard_resumes(tmp_path) -> None:
+    n, path = 6, str(tmp_path / "shard.npz")
+    start, stop = 0, 360
+    partial = StreakStatistics._accumulate_ranks(n, start, 100)
+    shard.save_shard(path, shard.Shard(n, start, stop, 100, partial))
+    with pytest.raises(ValueError, match="unfinished"):
+        shard.merge_shard_files([path], complete=False)
+    finished = shard.run_shard(n, 0, 2, path)
+    assert finished.complete
+    expected = StreakStatistics._accumulate_ranks(n, start, stop)
+    assert np.array_equal(finished.accumulators.sl, expected.sl)
+    with pytest.raises(ValueError, match="different shard"):
+        shard.run_shard(n, 1, 2, path)
+
+
+def test_run_shard_rejects_bad_arguments(tmp_path, capsys) -> None:
+    path = str(tmp_path / "shard.npz")
+    with pytest.raises(ValueError, match="at least one permutation"):
+        shard.run_shard(4, 0, 2, path, every=0)
+    assert shard.main(["run", "4", "2", "2", path]) == 1
+    assert "Shard index" in capsys.readouterr().err
+    assert shard.main(["run", "4", "0", "2", path, "--every", "-1"]) == 1
+    assert "at least one permutation" in capsys.readouterr().err
+
+
+def test_load_shard_rejects_other_files(tmp_path) -> None:
+    path = str(tmp_path / "other.npz")
+    np.savez(path, x=np.zeros(3))
+    with pytest.raises(ValueError, match="not a shard"):
+        shard.load_shard(path)
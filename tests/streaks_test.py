@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 
 from streaks2.streaks import KvStreaks, Streak, Streaks, StreakStatistics
+from streaks2.utils import add_summary_row_column
 
 
 def test_streak_init_valid() -> None:
@@ -172,10 +173,96 @@ def test_str_stats_of_count() -> None:
 def test_str_stats_repr() -> None:
     n = 3
     stats = StreakStatistics(n)
-    assert repr(stats).startswith("StreakStatistics(n=3, streaks_arr=")
+    assert repr(stats) == (
+        "StreakStatistics(n=3, engine='enumerate', length_counts=[11  6  3  2])"
+    )
+    assert "streak_rows" not in vars(stats)  # no permutation was listed
 
 
 def test_str_stats_str() -> None:
     n = 3
     stats = StreakStatistics(n)
     assert isinstance(str(stats), str)
+
+
+def test_str_stats_missing_streak_lengths_match_absent_matrix() -> None:
+    """Test that the accumulated absent counts match the per-permutation matrix."""
+    for n in range(1, 7):
+        stats = StreakStatistics(n)
+        assert np.array_equal(
+            stats.missing_streak_lengths(), stats._streak_length_absent()[0]
+        )
+
+
+def test_str_stats_by_length_matches_streaks_arr() -> None:
+    """Test that the accumulated length counts match the per-permutation matrix."""
+    for n in range(1, 7):
+        stats = StreakStatistics(n)
+        assert np.array_equal(stats.length_counts, stats.streaks_arr[0])
+
+
+def test_kvstreaks_generate_kv_streaks_rank_range() -> None:
+    """Test that the generators can start and stop at any rank."""
+    everything = [
+        k.kv_streaks for k in KvStreaks.generate_kv_streaks_for_all_permutations(4)
+    ]
+    some = [
+        k.kv_streaks
+        for k in KvStreaks.generate_kv_streaks_for_all_permutations(4, 5, 13)
+    ]
+    assert some == everything[5:13]
+    assert len(list(Streaks.generate_streaks_for_all_permutations(4, 20))) == 4
+
+
+def test_streaks_share_backing_array() -> None:
+    """Test that the streaks of a Streaks object are views onto one compact array."""
+    streaks = Streaks([3, 1, 2, 5, 4])
+    assert streaks._data.typecode == "b"
+    views = streaks.streaks
+    assert [s.streak for s in views] == [[3], [1, 2, 5, 4]]
+    assert all(s._seq is streaks._data for s in views)
+    assert [len(s) for s in views] == [1, 4]
+    assert not hasattr(views[0], "__dict__")
+
+
+def test_streaks_wide_values() -> None:
+    """Test that values beyond 8 and 64 bits are kept exactly."""
+    assert Streaks([1000, 5])._data.typecode == "h"
+    big = Streaks([2**70, 1])
+    assert big.streaks == [Streak([2**70]), Streak([1])]
+    assert len(big) == 2
+
+
+def test_find_streaks_views() -> None:
+    """Test that _find_streaks makes views of the sequence it is given."""
+    seq = [2, 3, 1]
+    streaks = Streaks([])._find_streaks(seq)
+    assert streaks == [Streak([2, 3]), Streak([1])]
+    assert streaks[0]._seq is seq
+
+
+def test_streak_lengths_compact() -> None:
+    """Test that the per-permutation rows are stored in the smallest type."""
+    stats = StreakStatistics(4)
+    assert stats.streak_rows.dtype == np.uint8
+    assert stats.streak_rows.shape == (24, 5)
+    assert "streaks_arr" not in vars(stats)  # only the compact rows are kept
+    assert stats.streaks_arr[0, 0] == 50
+    assert stats.streaks_arr is stats.streaks_arr  # built once
+    assert np.array_equal(
+        stats.streaks_arr,
+        add_summary_row_column(np.vstack([np.zeros((1, 5), int), stats.streak_rows])),
+    )
+
+
+def test_str_stats_missing_streak_length_set() -> None:
+    """Test the joint absent count against the per-permutation matrix."""
+    n = 6
+    stats = StreakStatistics(n)
+    rows = stats.streaks_arr[1:]
+    for lengths in ([1], [2, 3], [1, 4, 6]):
+        expected = np.count_nonzero(np.all(rows[:, lengths] == 0, axis=1))
+        assert stats.missing_streak_length_set(lengths) == expected
+    assert StreakStatistics(n, engine="exact").missing_streak_length_set([2, 3]) == (
+        stats.missing_streak_length_set([2, 3])
+    )
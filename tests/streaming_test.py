@@ -0,0 +1,122 @@
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from streaks2.streaks import KvStreaks
+from streaks2.streaming import (
+    DistinctnessBitmap,
+    StreakTracker,
+    iter_chunks,
+    stream_streak_histogram,
+    stream_streaks,
+)
+
+
+def _records(source, **kwargs) -> dict:
+    records = {}
+    for starts, lengths in stream_streaks(source, **kwargs):
+        records.update(zip(starts.tolist(), lengths.tolist()))
+    return records
+
+
+def test_stream_streaks_matches_kv_streaks() -> None:
+    perm = np.random.default_rng(0).permutation(1000) + 1
+    expected = KvStreaks(perm.tolist()).kv_streaks
+    for chunk_size in (1, 2, 7, 100, 5000):
+        assert _records(perm, chunk_size=chunk_size) == expected
+
+
+def test_stream_streaks_from_iterator() -> None:
+    seq = [5, 7, 2, 9, 1, 3, 4]
+    assert _records(iter(seq), chunk_size=3) == KvStreaks(seq).kv_streaks
+
+
+def test_stream_streaks_from_file(tmp_path) -> None:
+    perm = (np.random.default_rng(1).permutation(500) + 1).astype(np.int32)
+    path = tmp_path / "perm.bin"
+    perm.tofile(path)
+    records = _records(str(path), chunk_size=64, dtype=np.int32, max_value=500)
+    assert records == KvStreaks(perm.tolist()).kv_streaks
+    mapped = np.memmap(path, dtype=np.int32, mode="r")
+    assert _records(mapped, chunk_size=33) == records
+
+
+def test_stream_streaks_empty() -> None:
+    assert list(stream_streaks([])) == []
+
+
+def test_stream_streaks_repeats() -> None:
+    with pytest.raises(ValueError, match=r"^Sequence must contain distinct elements.$"):
+        list(stream_streaks([3, 1, 2, 3], chunk_size=2))
+    with pytest.raises(ValueError, match=r"^Sequence must contain distinct elements.$"):
+        list(stream_streaks([3, 1, 1], chunk_size=10))
+    records = _records([3, 1, 3], chunk_size=2, check_distinct=False)
+    assert records == {3: 1, 1: 2}
+
+
+def test_stream_streak_histogram() -> None:
+    perm = np.random.default_rng(2).permutation(2000) + 1
+    kv = KvStreaks(perm.tolist()).kv_streaks
+    histogram = stream_streak_histogram(perm, chunk_size=128)
+    assert histogram[0] == len(kv)
+    assert histogram.size == max(kv.values()) + 1
+    for length in range(1, histogram.size):
+        assert histogram[length] == sum(1 for v in kv.values() if v == length)
+
+
+def test_distinctness_bitmap() -> None:
+    bitmap = DistinctnessBitmap(min_value=10, max_value=20)
+    assert bitmap.bits.size == 2
+    bitmap.add(np.array([10, 15]))
+    bitmap.add(np.array([30]))
+    assert bitmap.bits.size == 3
+    with pytest.raises(ValueError, match=r"^Sequence must contain distinct elements.$"):
+        bitmap.add(np.array([15]))
+    with pytest.raises(ValueError, match=r"^Values must be at least 10.$"):
+        bitmap.add(np.array([9]))
+
+
+def test_iter_chunks_value_error() -> None:
+    with pytest.raises(ValueError, match=r"^Input array must be 1-dimensional.$"):
+        list(iter_chunks(np.zeros((2, 2))))
+
+
+def test_streak_tracker_matches_kv_streaks() -> None:
+    seq = (np.random.default_rng(3).permutation(300) + 1).tolist()
+    tracker = StreakTracker()
+    for i, x in enumerate(seq):
+        tracker.push(x)
+        if i % 37 == 0:
+            expected = KvStreaks(seq[: i + 1]).kv_streaks
+            assert tracker.snapshot().kv_streaks == expected
+            assert len(tracker) == len(expected)
+    kv = KvStreaks(seq).kv_streaks
+    assert tracker.snapshot().kv_streaks == kv
+    assert tracker.length_counts() == dict(Counter(kv.values()))
+    assert tracker.elements == 300
+
+
+def test_streak_tracker_extend_and_current() -> None:
+    tracker = StreakTracker()
+    assert tracker.current_streak is None
+    assert len(tracker) == 0
+    assert tracker.snapshot().kv_streaks == {}
+    tracker.extend(np.array([4, 6, 2, 5, 7]))
+    assert tracker.current_streak == (2, 3)
+    assert tracker.length_counts() == {2: 1, 3: 1}
+    with pytest.raises(ValueError, match=r"^Sequence must contain distinct elements.$"):
+        tracker.push(2)
+
+
+def test_streak_tracker_serialization() -> None:
+    tracker = StreakTracker()
+    tracker.extend([5, 8, 3, 9, 1])
+    restored = StreakTracker.from_dict(json.loads(json.dumps(tracker.to_dict())))
+    for x in (6, 0, 2):
+        tracker.push(x)
+        restored.push(x)
+    assert restored.snapshot().kv_streaks == tracker.snapshot().kv_streaks
+    assert restored.length_counts() == tracker.length_counts()
+    assert restored.elements == tracker.elements
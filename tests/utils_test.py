@@ -1,7 +1,12 @@
+from collections import Counter
+from itertools import permutations
+
 import numpy as np
 import pytest
 
 from streaks2 import utils
+from streaks2.batch import find_streaks_batch
+from streaks2.streaks import StreakStatistics
 
 
 def test_random_permutation() -> None:
@@ -144,3 +149,140 @@ def test_create_array_from_kv_raises() -> None:
         ValueError, match=r"^keys and vals arrays must be 1-dimensional.$"
     ):
         utils.create_array_from_kv(keys_multi2, vals_multi2)
+
+
+def test_random_streak_lengths() -> None:
+    rng = np.random.default_rng(0)
+    lengths, counts = utils.random_streak_lengths(10, 1000, rng)
+    assert counts.shape == (1000,)
+    assert lengths.size == np.sum(counts)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    for row in range(1000):
+        assert np.sum(lengths[offsets[row] : offsets[row + 1]]) == 10
+
+
+def test_random_streak_lengths_distribution() -> None:
+    """Test that sampled streak lengths and counts follow the exact distribution."""
+    n, size = 6, 200_000
+    stats = StreakStatistics(n, engine="exact")
+    nperms = stats.counts[0]
+    lengths, counts = utils.random_streak_lengths(n, size, np.random.default_rng(1))
+    observed = np.bincount(counts, minlength=n + 1)[1:] / size
+    expected = stats.by_count().astype(float) / nperms
+    assert np.all(np.abs(observed - expected) < 5 * np.sqrt(expected / size) + 1e-9)
+    observed = np.bincount(lengths, minlength=n + 1)[1:] / size
+    expected = stats.by_length().astype(float) / nperms
+    assert np.allclose(observed, expected, rtol=0.05)
+
+
+def test_random_streak_lengths_edge_cases() -> None:
+    lengths, counts = utils.random_streak_lengths(1, 3)
+    np.testing.assert_array_equal(lengths, [1, 1, 1])
+    np.testing.assert_array_equal(counts, [1, 1, 1])
+    lengths, counts = utils.random_streak_lengths(0, 2)
+    assert lengths.size == 0
+    np.testing.assert_array_equal(counts, [0, 0])
+
+
+def test_random_streak_counts_huge_n() -> None:
+    n = 10**7
+    counts = utils.random_streak_counts(n, 10_000, np.random.default_rng(2))
+    assert abs(np.mean(counts) - (np.log(n) + utils.GAMMA)) < 0.2
+
+
+def test_rank_unrank_permutation() -> None:
+    n = 5
+    for rank, perm in enumerate(permutations(range(1, n + 1))):
+        assert utils.rank_permutation(perm) == rank
+        assert utils.unrank_permutation(rank, n) == perm
+    assert utils.rank_permutation([]) == 0
+    assert utils.unrank_permutation(0, 0) == ()
+
+
+def test_rank_unrank_permutation_value_errors() -> None:
+    with pytest.raises(ValueError, match=r"^Sequence must be a permutation of 1..n.$"):
+        utils.rank_permutation([1, 3])
+    with pytest.raises(ValueError, match=r"^Rank must be in the range 0 to n! - 1.$"):
+        utils.unrank_permutation(6, 3)
+
+
+def test_generate_permutations() -> None:
+    n = 5
+    all_perms = list(permutations(range(1, n + 1)))
+    assert list(utils.generate_permutations(n)) == all_perms
+    assert list(utils.generate_permutations(n, 17, 45)) == all_perms[17:45]
+    assert list(utils.generate_permutations(n, 30, 30)) == []
+    with pytest.raises(
+        ValueError, match=r"^Ranks must satisfy 0 <= start <= stop <= n!.$"
+    ):
+        list(utils.generate_permutations(3, 2, 7))
+
+
+def test_permutation_blocks() -> None:
+    for n in (1, 4, 9):
+        expected = np.array(list(permutations(range(1, n + 1))))
+        for block_size in (1, 7, 50_000):
+            if n == 9 and block_size < 50_000:
+                continue
+            blocks = [
+                b.copy() for b in utils.permutation_blocks(n, block_size=block_size)
+            ]
+            assert all(b.dtype == np.uint8 for b in blocks)
+            assert np.array_equal(np.concatenate(blocks), expected)
+
+
+def test_permutation_blocks_range() -> None:
+    n = 10
+    blocks = list(utils.permutation_blocks(n, 40_000, 90_000, block_size=20_000))
+    assert [len(b) for b in blocks] == [20_000, 20_000, 10_000]
+    assert blocks[0].base is blocks[2].base  # one reused buffer
+    assert blocks[-1][-1].tolist() == list(utils.unrank_permutation(89_999, n))
+    assert [b.shape for b in utils.permutation_blocks(0)] == [(1, 0)]
+    assert list(utils.permutation_blocks(5, 30, 30)) == []
+    with pytest.raises(ValueError):
+        list(utils.permutation_blocks(3, 2, 7))
+
+
+def test_rank_ranges() -> None:
+    assert utils.rank_ranges(3, 4) == [(0, 1), (1, 3), (3, 4), (4, 6)]
+    assert utils.rank_ranges(4, 1) == [(0, 24)]
+
+
+def test_add_summary_row_column_widens_small_types() -> None:
+    arr = np.full((3, 3), 200, dtype=np.uint8)
+    result = utils.add_summary_row_column(arr)
+    assert result.dtype == int
+    assert result[0, 0] == 800
+
+
+def test_random_permutations_with_streaks_counts() -> None:
+    rng = np.random.default_rng(3)
+    for n, k in [(1, 1), (6, 1), (6, 6), (9, 4), (60, 2), (60, 45)]:
+        perms = utils.random_permutations_with_streaks(n, k, 500, rng)
+        assert perms.shape == (500, n)
+        assert np.array_equal(
+            np.sort(perms, axis=1), np.tile(np.arange(1, n + 1), (500, 1))
+        )
+        assert np.all(find_streaks_batch(perms)[2] == k)
+    assert (
+        utils.random_permutations_with_streaks(4, 4, 3).tolist() == [[4, 3, 2, 1]] * 3
+    )
+
+
+def test_random_permutations_with_streaks_uniform() -> None:
+    n, k, size = 5, 2, 50_000
+    perms = utils.random_permutations_with_streaks(n, k, size, np.random.default_rng(4))
+    frequencies = Counter(map(tuple, perms.tolist()))
+    assert len(frequencies) == StreakStatistics(n).of_count(k) == 50
+    expected = size / 50
+    # Each frequency is binomial; allow five standard deviations.
+    assert all(abs(f - expected) < 5 * np.sqrt(expected) for f in frequencies.values())
+
+
+def test_random_permutations_with_streaks_value_error() -> None:
+    with pytest.raises(
+        ValueError, match=r"^Streak count must be in the range 1 to n.$"
+    ):
+        utils.random_permutations_with_streaks(5, 0, 1)
+    with pytest.raises(ValueError):
+        utils.random_permutations_with_streaks(5, 6, 1)